@@ -1,8 +1,10 @@
 import heapq
 from typing import List, Tuple, Optional, Set
-from labyrinth.lab_to_jpg import convert_solution_to_image
+from algorithm.solve import solve_generated_maze
+from labyrinth.grid import trace_back_indices
+from labyrinth.instrument import NULL_TIMER, PhaseTimer
+from labyrinth.maze_core import OPEN_DIRS, MazeCore
 
-import time, tracemalloc
 
 class Node:
     def __init__(self, position: Tuple[int, int], g_cost: float = 0, h_cost: float = 0, parent=None):
@@ -21,40 +23,9 @@ class Node:
     def __hash__(self):
         return hash(self.position)
 
-def load_maze_from_file(filename: str) -> Optional[List[List[str]]]:
-    try:
-        with open(f"labyrinth/generated_maze/{filename}.txt", 'r') as file:
-            return [list(row) for row in file.read().strip().split('\n')]
-    except FileNotFoundError:
-        print(f"Error: File 'labyrinth/generated_maze/{filename}.txt' does not exist.")
-        return None
-
-def find_start_and_end(maze: List[List[str]]) -> Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]:
-    start = end = None
-    rows, cols = len(maze), len(maze[0]) if maze else 0
-    for col in range(cols):
-        if maze[0][col] == '.':
-            start = (0, col)
-            break
-    for col in range(cols):
-        if maze[rows-1][col] == '.':
-            end = (rows-1, col)
-            break
-    return start, end
-
 def heuristic(pos1: Tuple[int, int], pos2: Tuple[int, int]) -> float:
     return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
 
-def get_neighbors(position: Tuple[int, int], maze: List[List[str]]) -> List[Tuple[int, int]]:
-    row, col = position
-    rows, cols = len(maze), len(maze[0])
-    neighbors = []
-    for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-        nr, nc = row + dr, col + dc
-        if 0 <= nr < rows and 0 <= nc < cols and maze[nr][nc] == '.':
-            neighbors.append((nr,nc))
-    return neighbors
-
 def reconstruct_path(node: Node) -> List[Tuple[int, int]]:
     path = []
     while node:
@@ -69,6 +40,7 @@ def a_star_solver(maze: List[List[str]], start: Tuple[int,int], end: Tuple[int,i
     heapq.heappush(open_set, start_node)
     g_costs = {start:0}
     nodes_explored = 0
+    get_neighbors = MazeCore.of(maze).neighbors
 
     while open_set:
         current_node = heapq.heappop(open_set)
@@ -77,7 +49,7 @@ def a_star_solver(maze: List[List[str]], start: Tuple[int,int], end: Tuple[int,i
             return reconstruct_path(current_node), closed_set
         closed_set.add(current_pos)
         nodes_explored += 1
-        for neighbor in get_neighbors(current_pos, maze):
+        for neighbor in get_neighbors(current_pos):
             if neighbor in closed_set:
                 continue
             tentative_g = current_node.g_cost + 1
@@ -86,48 +58,84 @@ def a_star_solver(maze: List[List[str]], start: Tuple[int,int], end: Tuple[int,i
                 heapq.heappush(open_set, Node(neighbor, tentative_g, heuristic(neighbor,end), current_node))
     return None
 
-def visualize_solution(maze: List[List[str]], path: List[Tuple[int,int]], explored: Set[Tuple[int,int]]) -> str:
-    visual_maze = [row[:] for row in maze]
-    for r,c in explored:
-        if (r,c) not in path:
-            visual_maze[r][c] = 'O'
-    for i,(r,c) in enumerate(path):
-        if i == 0: visual_maze[r][c] = 'S'
-        elif i == len(path)-1: visual_maze[r][c] = 'E'
-        else: visual_maze[r][c] = '*'
-    return '\n'.join(''.join(row) for row in visual_maze)
-
-def solve_maze_astar(filename: str) -> bool:
-    maze = load_maze_from_file(filename)
-    if maze is None:
-        return False
-    
-    start_time = time.perf_counter()
-    tracemalloc.start()
-    tracemalloc.reset_peak()
-
-    start, end = find_start_and_end(maze)
-    if start is None or end is None:
-        print("Error: Maze entrance or exit not found.")
-        return False
-    result = a_star_solver(maze, start, end)
-    if result:
-        path, explored = result
-        solution_visual = visualize_solution(maze, path, explored)
-        solution_filename = f"{filename}_solution_astar"
-        with open(f"labyrinth/solutions_astar/{solution_filename}.txt", 'w') as f:
-            f.write(solution_visual)
-        print(f"Solution saved in labyrinth/solutions_astar/{solution_filename}.txt")
-        print(solution_visual)
-        
-        end_time = time.perf_counter()
-        peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-        print(f"Solution found in {end_time - start_time:.4f} seconds.")
-        print(f"Current memory usage is {peak[0] / 10**6:.4f}MB; Peak was {peak[1] / 10**6:.4f}MB")
-        
-        convert_solution_to_image(filename, "astar")
-        return True
+# parent bytes for the flat solver: 0 = not reached, 1..4 = reached by moving
+# in direction value-1, START; CLOSED is or-ed in once a cell is expanded
+START = 5
+CLOSED = 8
+_TO_DIRECTION = bytes(i & 7 for i in range(256))
+_TO_CLOSED = bytes(i >> 3 & 1 for i in range(256))
+
+def a_star_solver_flat(maze: List[List[str]], start: Tuple[int,int], end: Tuple[int,int], timer: PhaseTimer = NULL_TIMER) -> Optional[Tuple[List[Tuple[int,int]], Set[Tuple[int,int]]]]:
+    """A* over flat cell indices instead of Node objects.
+
+    Parents are one direction byte per cell with a closed bit on top, g-costs
+    are only kept for cells still in the open set, heap entries are plain
+    (f, counter, idx) tuples and the path is rebuilt by walking the parent
+    directions back from the exit, so the search needs the core's masks plus
+    one byte per cell. `timer` records the "search" and "reconstruct" phases
+    separately.
+    """
+    with timer.phase("search"):
+        core = MazeCore.of(maze)
+        found = _a_star_search(core, start, end)
+    if found is None:
+        return None
+    parent, end_idx = found
+    with timer.phase("reconstruct"):
+        explored = core.cell_set(parent.translate(_TO_CLOSED))
+        cells = trace_back_indices(parent.translate(_TO_DIRECTION), core.width, end_idx, START)
+        del parent
+        path = core.cells(cells)
+    timer.count("nodes_explored", len(explored))
+    return path, explored
+
+def _a_star_search(core, start, end):
+    masks, w = core.masks, core.width
+    parent = bytearray(len(masks))
+    steps = (-w, w, -1, 1)
+    open_dirs = OPEN_DIRS
+
+    start_idx = core.index(start)
+    end_idx = core.index(end)
+    end_r, end_c = divmod(end_idx, w)
+    parent[start_idx] = START
+    # g-cost of every cell pushed but not expanded yet; a maze's frontier is
+    # small next to its cell count, so this beats a per-cell array
+    open_g = {start_idx: 0}
+    counter = 0
+    open_set = [(heuristic(start, end), counter, start_idx)]
+    heappush, heappop = heapq.heappush, heapq.heappop
+
+    while open_set:
+        _, _, idx = heappop(open_set)
+        if parent[idx] & CLOSED:
+            continue
+        if idx == end_idx:
+            break
+        parent[idx] |= CLOSED
+        tentative_g = open_g.pop(idx) + 1
+        for d in open_dirs[masks[idx]]:
+            n = idx + steps[d]
+            if parent[n] & CLOSED:
+                continue
+            g = open_g.get(n)
+            if g is not None and tentative_g >= g:
+                continue
+            open_g[n] = tentative_g
+            parent[n] = d + 1
+            r, c = divmod(n, w)
+            counter += 1
+            heappush(open_set, (tentative_g + abs(r - end_r) + abs(c - end_c), counter, n))
+    else:
+        return None
+    return parent, end_idx
+
+def solve_maze_astar(filename: str, flat: bool = True, memory: str = "rss", show: bool = True,
+                  use_cache: bool = False) -> bool:
+    if flat:
+        solver = a_star_solver_flat
     else:
-        print("No path found.")
-        return False
+        def solver(maze, start, end, timer):
+            with timer.phase("search"):
+                return a_star_solver(maze, start, end)
+    return solve_generated_maze(filename, "astar", solver, {"flat": flat}, memory, show, use_cache)
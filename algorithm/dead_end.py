@@ -0,0 +1,86 @@
+# dead_end.py
+# Dead-end filling: repeatedly wall off every open cell with a single open
+# neighbour (other than the entrance and exit) until none is left. In a
+# perfect maze only the solution survives. Each cell is filled at most once,
+# so the whole solve is linear in the number of cells, with no heap and no
+# search order to get wrong.
+from typing import List, Optional, Set, Tuple
+
+from labyrinth.grid import trace_back
+from labyrinth.instrument import NULL_TIMER, PhaseTimer
+from labyrinth.maze_core import OPEN_BIT, MazeCore
+
+# State bytes on the padded grid: 0 = open, 1..4 = on the final BFS, entered
+# by moving in direction value-1, START, BLOCKED = wall or border, FILLED
+START = 5
+BLOCKED = 6
+FILLED = 7
+_TO_EXPLORED = bytes(1 if 1 <= i <= START or i == FILLED else 0 for i in range(256))
+# mask -> 1 for an open cell with at most one open neighbour
+_DEAD_END = bytes(1 if mask & OPEN_BIT and bin(mask & 15).count("1") <= 1 else 0 for mask in range(256))
+
+
+def dead_end_cells(core: MazeCore) -> List[int]:
+    """Padded indices of open cells with at most one open neighbour, read off the core's masks."""
+    flags = core.masks.translate(_DEAD_END)
+    cells = []
+    i = flags.find(1)
+    while i != -1:
+        cells.append(i)
+        i = flags.find(1, i + 1)
+    return cells
+
+
+def dead_end_filling_solver(maze: List[List[str]], start: Tuple[int, int], end: Tuple[int, int],
+                            timer: PhaseTimer = NULL_TIMER) -> Optional[Tuple[List[Tuple[int, int]], Set[Tuple[int, int]]]]:
+    """Fill dead ends, then BFS the start-to-exit path through what remains.
+
+    Explored cells are the filled ones plus those the final BFS touched. With
+    loops the remainder is more than the path, and the BFS still returns a
+    shortest route through it.
+    """
+    with timer.phase("search"):
+        core = MazeCore.of(maze)
+        state, w = core.state(BLOCKED), core.width
+        steps = (-w, w, -1, 1)
+        start_idx = core.index(start)
+        end_idx = core.index(end)
+        filled = 0
+        for p in dead_end_cells(core):
+            # fill back along the corridor while the cell stays a dead end
+            while p != start_idx and p != end_idx and not state[p]:
+                state[p] = FILLED
+                filled += 1
+                # step to the one open neighbour left if it became a dead end too
+                if not state[p - w]:
+                    q = p - w
+                elif not state[p + w]:
+                    q = p + w
+                elif not state[p - 1]:
+                    q = p - 1
+                elif not state[p + 1]:
+                    q = p + 1
+                else:
+                    break
+                if (not state[q - w]) + (not state[q + w]) + (not state[q - 1]) + (not state[q + 1]) > 1:
+                    break
+                p = q
+
+        state[start_idx] = START
+        queue, head = [start_idx], 0
+        while head < len(queue) and not state[end_idx]:
+            idx = queue[head]
+            head += 1
+            for d in (0, 1, 2, 3):
+                n = idx + steps[d]
+                if not state[n]:
+                    state[n] = d + 1
+                    queue.append(n)
+    timer.count("cells_filled", filled)
+    if start_idx != end_idx and not (1 <= state[end_idx] <= 4):
+        return None
+    with timer.phase("reconstruct"):
+        path = trace_back(state, w, end_idx, START)
+        explored = core.cell_set(state.translate(_TO_EXPLORED))
+    timer.count("nodes_explored", len(explored))
+    return path, explored
@@ -0,0 +1,267 @@
+# junction_graph.py
+# Contracts a maze into a weighted graph whose nodes are junctions, dead ends
+# and the two endpoints, and whose edges are whole corridors. Solvers then
+# take one step per corridor instead of one per cell, and the cell path is
+# only expanded at the end for output.
+import heapq
+import os
+import struct
+from array import array
+from typing import List, Optional, Set, Tuple
+
+from labyrinth.grid import CellSet
+from labyrinth.instrument import NULL_TIMER, PhaseTimer
+from labyrinth.maze_core import OPEN_BIT, MazeCore
+
+OPPOSITE = (1, 0, 3, 2)
+# For a corridor entered moving in direction d: try straight on, then the two turns
+TURNS = ((0, 2, 3), (1, 2, 3), (2, 0, 1), (3, 0, 1))
+UNREACHED = 2**31 - 1
+
+MAGIC = b"AMJG"
+VERSION = 1
+# magic, version, rows, cols, nodes, start idx, end idx, maze file size, maze mtime_ns
+HEADER = struct.Struct("<4sHIIIqqqq")
+
+
+# mask -> 1 for a junction or dead end: an open cell without exactly two open neighbours
+_NODE = bytes(1 if mask & OPEN_BIT and bin(mask & 15).count("1") != 2 else 0 for mask in range(256))
+
+
+class JunctionGraph:
+    """Fixed-degree adjacency: node u's edge in direction d sits in slot 4*u + d.
+
+    `nodes` holds padded cell indices, `target`/`weight` the node reached and
+    the corridor length for each slot (-1 / 0 when there is no corridor).
+    """
+
+    def __init__(self, rows: int, cols: int, nodes: array, target: array, weight: array,
+                 start_idx: int, end_idx: int, node_of: Optional[dict] = None):
+        self.rows, self.cols = rows, cols
+        self.width = cols + 2
+        self.nodes = nodes
+        self.target = target
+        self.weight = weight
+        self.start_idx, self.end_idx = start_idx, end_idx
+        self.node_of = node_of if node_of is not None else {idx: i for i, idx in enumerate(nodes)}
+
+    @classmethod
+    def build(cls, maze, start: Tuple[int, int], end: Tuple[int, int]) -> "JunctionGraph":
+        core = MazeCore.of(maze)
+        masks, w = core.masks, core.width
+        start_idx, end_idx = core.index(start), core.index(end)
+
+        flags = masks.translate(_NODE)
+        flags[start_idx] = flags[end_idx] = 1
+        nodes = array("i")
+        i = flags.find(1)
+        while i != -1:
+            nodes.append(i)
+            i = flags.find(1, i + 1)
+        del flags
+
+        node_of = {idx: n for n, idx in enumerate(nodes)}
+        target = array("i", [-1]) * (4 * len(nodes))
+        weight = array("i", [0]) * (4 * len(nodes))
+        steps = (-w, w, -1, 1)
+        for u, idx in enumerate(nodes):
+            for d in (0, 1, 2, 3):
+                if target[4 * u + d] != -1 or not masks[idx] >> d & 1:
+                    continue
+                # walk the corridor until the next node
+                p, move, length = idx + steps[d], d, 1
+                while p not in node_of:
+                    for move in TURNS[move]:
+                        if masks[p] >> move & 1:
+                            break
+                    p += steps[move]
+                    length += 1
+                v = node_of[p]
+                target[4 * u + d] = v
+                weight[4 * u + d] = length
+                target[4 * v + OPPOSITE[move]] = u
+                weight[4 * v + OPPOSITE[move]] = length
+        return cls(core.rows, core.cols, nodes, target, weight, start_idx, end_idx, node_of)
+
+    def node_cell(self, u: int) -> Tuple[int, int]:
+        r, c = divmod(self.nodes[u], self.width)
+        return r - 1, c - 1
+
+    def expand(self, maze, node_path: List[int], slots: List[int]) -> List[Tuple[int, int]]:
+        """Turn a node path (and the slot used to leave each node) into cells."""
+        core = MazeCore.of(maze)
+        masks, w = core.masks, core.width
+        steps = (-w, w, -1, 1)
+        cells = [self.nodes[node_path[0]]]
+        for u, slot in zip(node_path, slots):
+            goal = self.nodes[self.target[slot]]
+            p, move = self.nodes[u], slot & 3
+            p += steps[move]
+            cells.append(p)
+            while p != goal:
+                for move in TURNS[move]:
+                    if masks[p] >> move & 1:
+                        break
+                p += steps[move]
+                cells.append(p)
+        return core.cells(cells)
+
+    def explored_cells(self, closed: bytearray) -> CellSet:
+        flags = bytearray(self.rows * self.cols)
+        i = closed.find(1)
+        while i != -1:
+            r, c = self.node_cell(i)
+            flags[r * self.cols + c] = 1
+            i = closed.find(1, i + 1)
+        return CellSet(flags, self.cols)
+
+    def save(self, path: str, maze_size: int = 0, maze_mtime_ns: int = 0) -> None:
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.rows, self.cols, len(self.nodes),
+                                self.start_idx, self.end_idx, maze_size, maze_mtime_ns))
+            self.nodes.tofile(f)
+            self.target.tofile(f)
+            self.weight.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["JunctionGraph", int, int]:
+        """Return the graph plus the maze file size and mtime it was built from."""
+        with open(path, "rb") as f:
+            magic, version, rows, cols, n, start_idx, end_idx, size, mtime = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} junction graph.")
+            nodes, target, weight = array("i"), array("i"), array("i")
+            nodes.fromfile(f, n)
+            target.fromfile(f, 4 * n)
+            weight.fromfile(f, 4 * n)
+        return cls(rows, cols, nodes, target, weight, start_idx, end_idx), size, mtime
+
+
+def cache_path(maze_path: str) -> str:
+    return maze_path + ".jgraph"
+
+
+def load_or_build(maze_path: str, maze, start: Tuple[int, int], end: Tuple[int, int],
+                  timer: PhaseTimer = NULL_TIMER) -> JunctionGraph:
+    """Reuse <maze_path>.jgraph when it matches the maze file, else rebuild it."""
+    st = os.stat(maze_path)
+    core = MazeCore.of(maze)
+    start_idx, end_idx = core.index(start), core.index(end)
+    cached = cache_path(maze_path)
+    if os.path.exists(cached):
+        with timer.phase("load_graph"):
+            try:
+                graph, size, mtime = JunctionGraph.load(cached)
+            except (OSError, ValueError, EOFError, struct.error):
+                graph = None
+        if (graph is not None and size == st.st_size and mtime == st.st_mtime_ns
+                and graph.start_idx == start_idx and graph.end_idx == end_idx):
+            return graph
+    with timer.phase("contract"):
+        graph = JunctionGraph.build(core, start, end)
+    try:
+        graph.save(cached, st.st_size, st.st_mtime_ns)
+    except OSError:
+        pass
+    return graph
+
+
+def _graph_for(maze, start, end, graph, timer):
+    if graph is None:
+        with timer.phase("contract"):
+            graph = JunctionGraph.build(maze, start, end)
+    return graph
+
+
+def _node_path(graph: JunctionGraph, parent_slot: array, goal: int):
+    node_path, slots = [goal], []
+    u = goal
+    while parent_slot[u] != -1:
+        slot = parent_slot[u]
+        u = slot >> 2
+        node_path.append(u)
+        slots.append(slot)
+    node_path.reverse()
+    slots.reverse()
+    return node_path, slots
+
+
+def a_star_graph_solver(maze, start: Tuple[int, int], end: Tuple[int, int], timer: PhaseTimer = NULL_TIMER,
+                        graph: Optional[JunctionGraph] = None) -> Optional[Tuple[List[Tuple[int, int]], Set[Tuple[int, int]]]]:
+    """A* over corridors; explored cells are the junctions it settled."""
+    core = MazeCore.of(maze)
+    graph = _graph_for(core, start, end, graph, timer)
+    with timer.phase("search"):
+        n = len(graph.nodes)
+        target, weight, nodes, w = graph.target, graph.weight, graph.nodes, graph.width
+        src, goal = graph.node_of[graph.start_idx], graph.node_of[graph.end_idx]
+        goal_r, goal_c = divmod(graph.end_idx, w)
+        g_costs = array("i", [UNREACHED]) * n
+        parent_slot = array("i", [-1]) * n
+        closed = bytearray(n)
+        g_costs[src] = 0
+        counter = 0
+        open_set = [(0, counter, src)]
+        heappush, heappop = heapq.heappush, heapq.heappop
+        while open_set:
+            _, _, u = heappop(open_set)
+            if closed[u]:
+                continue
+            if u == goal:
+                break
+            closed[u] = 1
+            gu = g_costs[u]
+            for slot in range(4 * u, 4 * u + 4):
+                v = target[slot]
+                if v == -1 or closed[v]:
+                    continue
+                ng = gu + weight[slot]
+                if ng < g_costs[v]:
+                    g_costs[v] = ng
+                    parent_slot[v] = slot
+                    r, c = divmod(nodes[v], w)
+                    counter += 1
+                    heappush(open_set, (ng + abs(r - goal_r) + abs(c - goal_c), counter, v))
+        else:
+            return None
+    timer.count("nodes_explored", closed.count(1))
+    with timer.phase("reconstruct"):
+        node_path, slots = _node_path(graph, parent_slot, goal)
+        path = graph.expand(core, node_path, slots)
+        explored = graph.explored_cells(closed)
+    return path, explored
+
+
+def backtracking_graph_solver(maze, start: Tuple[int, int], end: Tuple[int, int], timer: PhaseTimer = NULL_TIMER,
+                              graph: Optional[JunctionGraph] = None) -> Optional[Tuple[List[Tuple[int, int]], Set[Tuple[int, int]]]]:
+    """Iterative DFS over corridors, trying directions up, down, left, right like the cell solver."""
+    core = MazeCore.of(maze)
+    graph = _graph_for(core, start, end, graph, timer)
+    with timer.phase("search"):
+        n = len(graph.nodes)
+        target = graph.target
+        src, goal = graph.node_of[graph.start_idx], graph.node_of[graph.end_idx]
+        parent_slot = array("i", [-1]) * n
+        next_slot = array("i", range(0, 4 * n, 4))
+        visited = bytearray(n)
+        visited[src] = 1
+        u = src
+        while u != goal:
+            slot = next_slot[u]
+            if slot == 4 * u + 4:
+                if u == src:
+                    return None
+                u = parent_slot[u] >> 2
+                continue
+            next_slot[u] = slot + 1
+            v = target[slot]
+            if v != -1 and not visited[v]:
+                visited[v] = 1
+                parent_slot[v] = slot
+                u = v
+    timer.count("nodes_explored", visited.count(1))
+    with timer.phase("reconstruct"):
+        node_path, slots = _node_path(graph, parent_slot, goal)
+        path = graph.expand(core, node_path, slots)
+        explored = graph.explored_cells(visited)
+    return path, explored
@@ -0,0 +1,143 @@
+# multi_query.py
+# Answer many (start, goal) questions about one maze. The maze core is built
+# once. For each distinct goal, one BFS distance field is computed;
+# every query towards that goal then just walks downhill from its start.
+# The BFS records each cell's downhill direction, so a query costs one
+# lookup per cell of its path once the field exists.
+from array import array
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from labyrinth.maze_core import OPEN_DIRS, MazeCore
+
+UNREACHED = -1
+# direction of the step back towards the cell a BFS came from
+BACK = (1, 0, 3, 2)
+
+Cell = Tuple[int, int]
+
+
+class QueryResults:
+    """Paths for a batch of queries, stored CSR-style in flat arrays.
+
+    `distances[i]` is the length of query i's path in steps, or -1 if it has
+    none. Its cells are `cells[offsets[i]:offsets[i + 1]]`, each stored as the
+    flat index row * cols + col.
+    """
+
+    def __init__(self, cols: int, distances: array, offsets: array, cells: array):
+        self.cols = cols
+        self.distances = distances
+        self.offsets = offsets
+        self.cells = cells
+
+    def __len__(self) -> int:
+        return len(self.distances)
+
+    def path(self, i: int) -> List[Cell]:
+        return [divmod(idx, self.cols) for idx in self.cells[self.offsets[i]:self.offsets[i + 1]]]
+
+
+class MazeQueries:
+    """A maze loaded once, answering batches of point-to-point queries.
+
+    Up to `max_fields` distance fields (five bytes per cell each) are kept and
+    the least recently used is dropped first, so goals repeated across
+    batches cost nothing the second time.
+    """
+
+    def __init__(self, maze, max_fields: int = 4):
+        self.core = MazeCore.of(maze)
+        self.rows, self.cols = self.core.rows, self.core.cols
+        self.masks, self.width = self.core.masks, self.core.width
+        self.max_fields = max_fields
+        self._fields: "OrderedDict[int, Tuple[array, bytearray]]" = OrderedDict()
+
+    @classmethod
+    def from_file(cls, path: str, max_fields: int = 4) -> "MazeQueries":
+        return cls(MazeCore.load(path), max_fields)
+
+    def _idx(self, cell: Cell) -> Optional[int]:
+        r, c = cell
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return None
+        idx = (r + 1) * self.width + c + 1
+        return idx if self.masks[idx] else None
+
+    def distance_field(self, goal: Cell) -> Tuple[array, bytearray]:
+        """BFS from `goal` over padded cell indices.
+
+        Returns the distances (-1 where unreachable) and, per cell, the
+        direction (0..3 = up, down, left, right) of its next step towards goal.
+        """
+        goal_idx = self._idx(goal)
+        if goal_idx is None:
+            raise ValueError(f"Goal {goal} is not an open cell.")
+        cached = self._fields.get(goal_idx)
+        if cached is not None:
+            self._fields.move_to_end(goal_idx)
+            return cached
+
+        masks, w = self.masks, self.width
+        steps = (-w, w, -1, 1)
+        field = array("i", [UNREACHED]) * len(masks)
+        toward = bytearray(len(masks))
+        queue = array("i", [goal_idx])
+        field[goal_idx] = 0
+        head = 0
+        while head < len(queue):
+            idx = queue[head]
+            head += 1
+            d = field[idx] + 1
+            for move in OPEN_DIRS[masks[idx]]:
+                n = idx + steps[move]
+                if field[n] == UNREACHED:
+                    field[n] = d
+                    toward[n] = BACK[move]
+                    queue.append(n)
+
+        self._fields[goal_idx] = field, toward
+        while len(self._fields) > self.max_fields:
+            self._fields.popitem(last=False)
+        return field, toward
+
+    def solve(self, pairs: Iterable[Tuple[Cell, Cell]]) -> QueryResults:
+        """Answer every (start, goal) pair, computing one field per distinct goal."""
+        pairs = list(pairs)
+        by_goal = OrderedDict()
+        for i, (_, goal) in enumerate(pairs):
+            by_goal.setdefault(goal, []).append(i)
+
+        w, cols = self.width, self.cols
+        steps = (-w, w, -1, 1)
+        flat_steps = (-cols, cols, -1, 1)
+        paths: List[Optional[array]] = [None] * len(pairs)
+        for goal, queries in by_goal.items():
+            if self._idx(goal) is None:
+                continue
+            field, toward = self.distance_field(goal)
+            for i in queries:
+                (r, c), _ = pairs[i]
+                idx = self._idx((r, c))
+                if idx is None or field[idx] == UNREACHED:
+                    continue
+                # follow the recorded directions, moving the padded and the
+                # unpadded index together so no division is needed per cell
+                flat = r * cols + c
+                path = array("i", [flat]) * (field[idx] + 1)
+                for k in range(1, len(path)):
+                    d = toward[idx]
+                    idx += steps[d]
+                    flat += flat_steps[d]
+                    path[k] = flat
+                paths[i] = path
+
+        distances = array("i", [UNREACHED]) * len(pairs)
+        offsets = array("i", [0]) * (len(pairs) + 1)
+        cells = array("i")
+        for i, path in enumerate(paths):
+            if path is not None:
+                distances[i] = len(path) - 1
+                cells.extend(path)
+            offsets[i + 1] = len(cells)
+        return QueryResults(cols, distances, offsets, cells)
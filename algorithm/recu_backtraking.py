@@ -1,42 +1,20 @@
 from typing import List, Tuple, Optional, Set
-import time, tracemalloc
-from labyrinth.lab_to_jpg import convert_solution_to_image
+from algorithm.solve import solve_generated_maze
+from labyrinth.grid import trace_back
+from labyrinth.instrument import NULL_TIMER, PhaseTimer
+from labyrinth.maze_core import MazeCore
 
-def load_maze_from_file(filename: str) -> Optional[List[List[str]]]:
-    try:
-        with open(f"labyrinth/generated_maze/{filename}.txt", 'r') as file:
-            return [list(row) for row in file.read().strip().split('\n')]
-    except FileNotFoundError:
-        print(f"Error: File 'labyrinth/generated_maze/{filename}.txt' does not exist.")
-        return None
-
-def find_start_and_end(maze: List[List[str]]) -> Tuple[Optional[Tuple[int,int]], Optional[Tuple[int,int]]]:
-    start = end = None
-    rows, cols = len(maze), len(maze[0]) if maze else 0
-    for col in range(cols):
-        if maze[0][col] == '.':
-            start = (0,col)
-            break
-    for col in range(cols):
-        if maze[rows-1][col] == '.':
-            end = (rows-1,col)
-            break
-    return start, end
-
-def get_neighbors(pos: Tuple[int,int], maze: List[List[str]]) -> List[Tuple[int,int]]:
-    r,c = pos
-    rows,cols = len(maze), len(maze[0])
-    neighbors=[]
-    for dr,dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-        nr,nc = r+dr,c+dc
-        if 0<=nr<rows and 0<=nc<cols and maze[nr][nc]=='.':
-            neighbors.append((nr,nc))
-    return neighbors
+# State bytes for the iterative solver: 0 = open and unvisited,
+# 1..4 = visited, entered by moving in direction value-1, START, BLOCKED = wall
+START = 5
+BLOCKED = 6
+_TO_EXPLORED = bytes(1 if 1 <= i <= START else 0 for i in range(256))
 
 def recu_backtracking_solver(maze: List[List[str]], start: Tuple[int,int], end: Tuple[int,int]) -> Optional[Tuple[List[Tuple[int,int]], Set[Tuple[int,int]]]]:
     nodes_explored = 0
     max_depth = 0
     explored_cells = set()
+    get_neighbors = MazeCore.of(maze).neighbors
 
     def backtrack(current, path, visited, depth) -> bool:
         nonlocal nodes_explored, max_depth
@@ -46,7 +24,7 @@ def recu_backtracking_solver(maze: List[List[str]], start: Tuple[int,int], end:
         if current == end:
             return True
         visited.add(current)
-        for neighbor in get_neighbors(current, maze):
+        for neighbor in get_neighbors(current):
             if neighbor not in visited:
                 path.append(neighbor)
                 if backtrack(neighbor, path, visited, depth+1):
@@ -57,55 +35,78 @@ def recu_backtracking_solver(maze: List[List[str]], start: Tuple[int,int], end:
 
     path = [start]
     visited = set()
-    start_time = time.time()
     if backtrack(start,path,visited,0):
         print(f"Path found! Length: {len(path)}, Nodes explored: {nodes_explored}, Max depth: {max_depth}")
         return path, explored_cells
     print(f"No path found. Nodes explored: {nodes_explored}")
     return None
 
-def visualize_solution(maze: List[List[str]], path: List[Tuple[int,int]], explored: Set[Tuple[int,int]]) -> str:
-    visual_maze = [row[:] for row in maze]
-    for r,c in explored:
-        if (r,c) not in path:
-            visual_maze[r][c] = 'O'
-    for i,(r,c) in enumerate(path):
-        if i==0: visual_maze[r][c]='S'
-        elif i==len(path)-1: visual_maze[r][c]='E'
-        else: visual_maze[r][c]='*'
-    return '\n'.join(''.join(row) for row in visual_maze)
+def iterative_backtracking_solver(maze: List[List[str]], start: Tuple[int,int], end: Tuple[int,int], timer: PhaseTimer = NULL_TIMER, verbose: bool = True) -> Optional[Tuple[List[Tuple[int,int]], Set[Tuple[int,int]]]]:
+    """Depth-first search with the same neighbour order as the recursive solver,
+    but driven by a loop over a preallocated bytearray instead of the call stack.
 
-def solve_maze_backtracking(filename: str) -> bool:
-    maze = load_maze_from_file(filename)
-    if maze is None:
-        return False
-    
-    
-    start_time = time.perf_counter()
-    tracemalloc.start()
-    tracemalloc.reset_peak()
-    
-    start,end=find_start_and_end(maze)
-    if start is None or end is None:
-        print("Error: Maze entrance or exit not found.")
-        return False
-    result=recu_backtracking_solver(maze,start,end)
-    if result:
-        path, explored = result
-        solution_visual = visualize_solution(maze,path,explored)
-        solution_filename = f"{filename}_solution_backtracking"
-        with open(f"labyrinth/solutions_backtracking/{solution_filename}.txt",'w') as f:
-            f.write(solution_visual)
-        print(f"Solution saved in labyrinth/solutions_backtracking/{solution_filename}.txt")
-        print(solution_visual)
-        
-        end_time = time.perf_counter()
-        peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-        print(f"Solution found in {end_time - start_time:.4f} seconds.")
-        print(f"Current memory usage is {peak[0] / 10**6:.4f}MB; Peak was {peak[1] / 10**6:.4f}MB")
-        
-        convert_solution_to_image(filename,"backtracking")
-        return True
+    Cells stay visited once entered, so each cell is explored at most once, and
+    each cell remembers the direction it was entered from, which is all that is
+    needed to backtrack and to rebuild the path. nodes_explored and max_depth
+    are recorded on `timer` and printed unless verbose is False.
+    """
+    with timer.phase("search"):
+        core = MazeCore.of(maze)
+        state, goal, nodes_explored, max_depth = _backtracking_search(core, start, end)
+    timer.count("nodes_explored", nodes_explored)
+    timer.count("max_depth", max_depth)
+    if goal is None:
+        if verbose:
+            print(f"No path found. Nodes explored: {nodes_explored}")
+        return None
+    with timer.phase("reconstruct"):
+        path = trace_back(state, core.width, goal, START)
+        explored = core.cell_set(state.translate(_TO_EXPLORED))
+    if verbose:
+        print(f"Path found! Length: {len(path)}, Nodes explored: {nodes_explored}, Max depth: {max_depth}")
+    return path, explored
+
+def _backtracking_search(core, start, end):
+    state, w = core.state(BLOCKED), core.width
+
+    steps = (-w, w, -1, 1)
+    p = core.index(start)
+    goal = core.index(end)
+    state[p] = START
+    nodes_explored = 1
+    depth = max_depth = 0
+
+    while p != goal:
+        if not state[p - w]:
+            d = 0
+        elif not state[p + w]:
+            d = 1
+        elif not state[p - 1]:
+            d = 2
+        elif not state[p + 1]:
+            d = 3
+        else:
+            d = state[p]
+            if d == START:
+                return state, None, nodes_explored, max_depth
+            p -= steps[d - 1]
+            depth -= 1
+            continue
+        p += steps[d]
+        state[p] = d + 1
+        nodes_explored += 1
+        depth += 1
+        if depth > max_depth:
+            max_depth = depth
+    return state, goal, nodes_explored, max_depth
+
+def solve_maze_backtracking(filename: str, iterative: bool = True, memory: str = "rss", show: bool = True,
+                            use_cache: bool = False) -> bool:
+    if iterative:
+        def solver(maze, start, end, timer):
+            return iterative_backtracking_solver(maze, start, end, timer, verbose=False)
     else:
-        return False
+        def solver(maze, start, end, timer):
+            with timer.phase("search"):
+                return recu_backtracking_solver(maze, start, end)
+    return solve_generated_maze(filename, "backtracking", solver, {"iterative": iterative}, memory, show, use_cache)
@@ -0,0 +1,231 @@
+# result_cache.py
+# Content-addressed cache of solve results. The key hashes the maze file's
+# bytes with the algorithm and its parameters, so editing or regenerating a
+# maze changes the key and stale entries are never returned. Entries are
+# compact: the path as 2-bit moves from its first cell and the explored
+# cells as a 1-bit-per-cell bitmap, next to the solve counters. Recently used
+# entries are kept in memory too, and the disk tier drops the least recently
+# used files once it grows past its size budget.
+import hashlib
+import json
+import os
+import struct
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from labyrinth.grid import CellSet
+
+MAGIC = b"AMRC"
+VERSION = 1
+# magic, version, rows, cols, path length, path start row/col, stats length
+HEADER = struct.Struct("<4sHIIIIII")
+MOVES = ((-1, 0), (1, 0), (0, -1), (0, 1))
+_MOVE_INDEX = {move: str(i) for i, move in enumerate(MOVES)}
+_FLAGS_TO_BITS = bytes.maketrans(b"\0\1", b"01")
+_BITS_TO_FLAGS = bytes.maketrans(b"01", b"\0\1")
+
+DEFAULT_DIR = "labyrinth/solve_cache"
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+
+def pack_path(path: List[Tuple[int, int]]) -> bytes:
+    """Two bits per move after the first cell, most significant bits first."""
+    if len(path) < 2:
+        return b""
+    digits = "".join(_MOVE_INDEX[(r1 - r0, c1 - c0)] for (r0, c0), (r1, c1) in zip(path, path[1:]))
+    nbits = 2 * len(digits)
+    return (int(digits, 4) << (-nbits % 8)).to_bytes((nbits + 7) // 8, "big")
+
+
+def unpack_path(data: bytes, start: Tuple[int, int], length: int) -> List[Tuple[int, int]]:
+    if length == 0:
+        return []
+    r, c = start
+    path = [start]
+    bits = format(int.from_bytes(data, "big"), f"0{len(data) * 8}b") if data else ""
+    for i in range(0, 2 * (length - 1), 2):
+        dr, dc = MOVES[int(bits[i:i + 2], 2)]
+        r, c = r + dr, c + dc
+        path.append((r, c))
+    return path
+
+
+def explored_flags(explored, rows: int, cols: int) -> bytearray:
+    if isinstance(explored, CellSet):
+        return explored.flags
+    flags = bytearray(rows * cols)
+    for r, c in explored:
+        flags[r * cols + c] = 1
+    return flags
+
+
+def pack_flags(flags: bytes) -> bytes:
+    if not flags:
+        return b""
+    return (int(bytes(flags).translate(_FLAGS_TO_BITS), 2) << (-len(flags) % 8)).to_bytes((len(flags) + 7) // 8, "big")
+
+
+def unpack_flags(data: bytes, count: int) -> bytearray:
+    if not count:
+        return bytearray()
+    bits = format(int.from_bytes(data, "big"), f"0{len(data) * 8}b")[:count]
+    return bytearray(bits.encode("ascii").translate(_BITS_TO_FLAGS))
+
+
+class CachedResult:
+    def __init__(self, rows: int, cols: int, path: List[Tuple[int, int]], explored: CellSet, stats: dict):
+        self.rows, self.cols = rows, cols
+        self.path = path
+        self.explored = explored
+        self.stats = stats
+
+    def encode(self) -> bytes:
+        stats = json.dumps(self.stats, sort_keys=True).encode("utf-8")
+        start = self.path[0] if self.path else (0, 0)
+        return b"".join((HEADER.pack(MAGIC, VERSION, self.rows, self.cols, len(self.path), *start, len(stats)),
+                         stats, pack_path(self.path), pack_flags(self.explored.flags)))
+
+    @classmethod
+    def decode(cls, data: bytes) -> "CachedResult":
+        magic, version, rows, cols, length, sr, sc, stats_len = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} cached result.")
+        offset = HEADER.size
+        stats = json.loads(data[offset:offset + stats_len])
+        offset += stats_len
+        path_bytes = (2 * max(length - 1, 0) + 7) // 8
+        path = unpack_path(data[offset:offset + path_bytes], (sr, sc), length)
+        offset += path_bytes
+        flags = unpack_flags(data[offset:], rows * cols)
+        return cls(rows, cols, path, CellSet(flags, cols), stats)
+
+
+class ResultCache:
+    """Memory LRU of `memory_entries` results in front of a directory of
+    entries capped at `max_bytes` in total."""
+
+    def __init__(self, directory: str = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES, memory_entries: int = 32):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, CachedResult]" = OrderedDict()
+        self._digests = {}
+        self._disk_bytes: Optional[int] = None
+        self.hits = self.misses = 0
+
+    def maze_digest(self, maze_path: str) -> str:
+        """sha256 of the maze file, re-hashed only when its size or mtime changes."""
+        st = os.stat(maze_path)
+        memo = (os.path.abspath(maze_path), st.st_size, st.st_mtime_ns)
+        digest = self._digests.get(memo)
+        if digest is None:
+            h = hashlib.sha256()
+            with open(maze_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            digest = self._digests[memo] = h.hexdigest()
+        return digest
+
+    def key(self, maze_path: str, algo: str, params: Optional[dict] = None) -> str:
+        text = json.dumps([VERSION, self.maze_digest(maze_path), algo, params or {}], sort_keys=True)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".res")
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        result = self._memory.get(key)
+        if result is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return result
+        path = self._file(key)
+        try:
+            with open(path, "rb") as f:
+                result = CachedResult.decode(f.read())
+            os.utime(path)  # mark as recently used for eviction
+        except (OSError, ValueError, struct.error):
+            self.misses += 1
+            return None
+        self._remember(key, result)
+        self.hits += 1
+        return result
+
+    def put(self, key: str, rows: int, cols: int, path: List[Tuple[int, int]], explored: Iterable,
+            stats: dict) -> CachedResult:
+        result = CachedResult(rows, cols, path, CellSet(explored_flags(explored, rows, cols), cols), stats)
+        self._remember(key, result)
+        data = result.encode()
+        target = self._file(key)
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = f"{target}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, target)
+        except OSError:
+            return result
+        if self._disk_bytes is not None:
+            self._disk_bytes += len(data)
+        if self.disk_bytes() > self.max_bytes:
+            self.evict()
+        return result
+
+    def _remember(self, key: str, result: CachedResult) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".res"):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, st.st_size, st.st_mtime
+
+    def disk_bytes(self) -> int:
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(size for _, size, _ in self._entries())
+        return self._disk_bytes
+
+    def evict(self) -> int:
+        """Delete least recently used files until the disk tier fits max_bytes; return how many."""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._disk_bytes = total
+        return removed
+
+    def clear(self) -> None:
+        self._memory.clear()
+        for path, _, _ in list(self._entries()):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._disk_bytes = 0
+
+
+_default_cache: Optional[ResultCache] = None
+
+
+def default_cache() -> ResultCache:
+    """Process-wide cache in DEFAULT_DIR, shared by the interactive solvers."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
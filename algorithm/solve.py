@@ -0,0 +1,153 @@
+# solve.py
+# Path-based solving shared by the CLI and the batch runner. Returns a
+# SolveStats object with per-phase timings instead of printing them.
+# solve_generated_maze() is the interactive counterpart used by
+# solve_maze_astar/solve_maze_backtracking, which prints instead.
+import os
+from typing import Callable, Optional
+
+from algorithm.result_cache import ResultCache
+from labyrinth.instrument import PhaseTimer, SolveStats, memory_monitor
+from labyrinth.maze_core import MazeCore, load_maze_from_file, maze_file_path
+from labyrinth.overlay import print_overlay, write_overlay
+# The solver tables live in the registry so a solver module is only imported
+# when it is picked; re-exported here for existing callers.
+from labyrinth.registry import GRAPH_SOLVERS, RENDERERS, SOLVERS
+
+
+def _cache_lookup(cache: Optional[ResultCache], path: str, algo: str, timer: PhaseTimer,
+                  params: Optional[dict] = None):
+    """(key, hit) for `path` solved by `algo`; a hit's counters go into timer with cache_hit=1."""
+    if cache is None:
+        return None, None
+    with timer.phase("load"):
+        key = cache.key(path, algo, params)
+        hit = cache.get(key)
+    if hit is not None:
+        timer.counters.update(hit.stats["counters"], cache_hit=1)
+    return key, hit
+
+
+def _cache_store(cache: Optional[ResultCache], key: str, core: MazeCore, result, status: str,
+                 timer: PhaseTimer) -> None:
+    if cache is not None:
+        solved, explored = result or ([], ())
+        cache.put(key, core.rows, core.cols, solved, explored,
+                  {"status": status, "counters": dict(timer.counters), "phases": dict(timer.phases)})
+
+
+def _is_newer(path: str, than: str) -> bool:
+    try:
+        return os.path.getmtime(path) >= os.path.getmtime(than)
+    except OSError:
+        return False
+
+
+def solve_path(path: str, algo: str, solution_path: Optional[str] = None, memory: str = "none",
+               cache: Optional[ResultCache] = None) -> SolveStats:
+    """Solve the maze file at `path` and return its stats.
+
+    memory is "none", "rss" (sampled peak RSS, cheap) or "tracemalloc"
+    (exact Python allocations, but slows the search down). The solution is
+    only rendered (streamed row by row) when solution_path is given. With a
+    cache, a maze whose content was already solved by `algo` is not searched
+    again: the stored path and counters are returned, with counters["cache_hit"] = 1.
+    The maze is loaded once as a MazeCore and shared by the junction graph,
+    the solver and the overlay writer.
+    """
+    timer = PhaseTimer()
+    stats = SolveStats(maze=path, algorithm=algo)
+    with memory_monitor(memory, stats):
+        key, hit = _cache_lookup(cache, path, algo, timer)
+        if hit is not None:
+            stats.status = hit.stats["status"]
+            result = (hit.path, hit.explored) if hit.path else None
+            if result and solution_path is not None:
+                with timer.phase("load"):
+                    core = MazeCore.load(path)
+        else:
+            with timer.phase("load"):
+                core = MazeCore.load(path)
+            start, end = core.entrance, core.exit
+            if start is None or end is None:
+                stats.status = "no_endpoints"
+                result = None
+            else:
+                if algo in GRAPH_SOLVERS:
+                    from algorithm.junction_graph import load_or_build
+                    graph = load_or_build(path, core, start, end, timer)
+                    result = GRAPH_SOLVERS[algo](core, start, end, timer, graph=graph)
+                else:
+                    result = SOLVERS[algo](core, start, end, timer)
+                stats.status = "solved" if result else "no_path"
+                _cache_store(cache, key, core, result, stats.status, timer)
+        if result:
+            solved, explored = result
+            stats.path_length = len(solved)
+            stats.nodes_explored = timer.counters.get("nodes_explored", len(explored))
+            if solution_path is not None:
+                with timer.phase("write"):
+                    write_overlay(core, solved, explored, solution_path)
+                stats.solution = solution_path
+    stats.phases = timer.phases
+    stats.counters = timer.counters
+    return stats
+
+
+def solve_generated_maze(filename: str, algo: str, solver: Callable, params: Optional[dict] = None,
+                         memory: str = "rss", show: bool = True, use_cache: bool = False) -> bool:
+    """Solve labyrinth/generated_maze/<filename>, save the solution and print the report.
+
+    `solver(core, start, end, timer)` runs the search. Phases are timed
+    separately so "Solution found in" is the search alone, and memory is
+    sampled as RSS unless memory="tracemalloc" is asked for. With use_cache
+    the result cache in labyrinth/solve_cache/ is read and written; a cached
+    solution whose file is newer than the maze is not written again.
+    """
+    timer = PhaseTimer()
+    stats = SolveStats(maze=filename, algorithm=algo)
+    solution_path = f"labyrinth/solutions_{algo}/{filename}_solution_{algo}.txt"
+    with memory_monitor(memory, stats):
+        with timer.phase("load"):
+            core = load_maze_from_file(filename)
+        if core is None:
+            return False
+        if core.entrance is None or core.exit is None:
+            print("Error: Maze entrance or exit not found.")
+            return False
+        source = maze_file_path(filename)
+        cache = None
+        if use_cache:
+            from algorithm.result_cache import default_cache
+            cache = default_cache()
+        key, hit = _cache_lookup(cache, source, algo, timer, params)
+        if hit is not None:
+            result = (hit.path, hit.explored) if hit.path else None
+        else:
+            result = solver(core, core.entrance, core.exit, timer)
+            _cache_store(cache, key, core, result, "solved" if result else "no_path", timer)
+        if result and (hit is None or not _is_newer(solution_path, source)):
+            with timer.phase("write"):
+                write_overlay(core, result[0], result[1], solution_path)
+    stats.phases = timer.phases
+    stats.counters = timer.counters
+    if not result:
+        print("No path found.")
+        return False
+
+    path, explored = result
+    stats.status = "solved"
+    stats.path_length = len(path)
+    stats.nodes_explored = timer.counters.get("nodes_explored", len(explored))
+    stats.solution = solution_path
+    print(f"Solution saved in {stats.solution}")
+    if show:
+        print_overlay(core, path, explored)
+    if hit is not None:
+        print("Solution read from the result cache; no search was run.")
+    else:
+        print(f"Solution found in {stats.search_time:.4f} seconds.")
+    print(stats.report())
+
+    RENDERERS["solution-image"](filename, algo)
+    return True
@@ -0,0 +1,250 @@
+# tree_index.py
+# Point-to-point queries on perfect mazes. A perfect maze is a tree: once it
+# is rooted, every cell has one parent and a depth, and the path between two
+# cells goes through their lowest common ancestor (LCA). The LCA is found by
+# binary lifting over the junction graph's nodes, so the lifting table stays
+# small. Per cell we only keep its depth, its direction to the parent and the
+# node at the lower end of its corridor. A distance query is O(log n); a path
+# query is O(log n + path length).
+import mmap
+import os
+import struct
+from array import array
+from typing import List, Tuple
+
+from algorithm.junction_graph import OPPOSITE, TURNS, JunctionGraph
+from labyrinth.maze_core import MazeCore
+
+MAGIC = b"AMTI"
+VERSION = 1
+# magic, version, rows, cols, nodes, levels, root idx, maze file size, maze mtime_ns
+HEADER = struct.Struct("<4sHxxIIIIqqq")
+
+
+class TreeIndex:
+    """Rooted spanning tree of a perfect maze with an LCA index.
+
+    Cell arrays are indexed by padded cell index (row + 1) * (cols + 2) + col + 1:
+    `depth` (cells from the root, -1 for walls), `child` (the junction node at
+    the lower end of the cell's corridor) and `up_dir` (direction to the
+    parent plus one, 0 for the root). Node arrays hold each node's cell, its
+    hop depth and the lifting table, where up[k][u] is the 2**k-th ancestor.
+    """
+
+    def __init__(self, rows: int, cols: int, root_idx: int, node_cells, hop, up, depth, child, up_dir):
+        self.rows, self.cols = rows, cols
+        self.width = cols + 2
+        self.root_idx = root_idx
+        self.node_cells = node_cells
+        self.hop = hop
+        self.up = up
+        self.depth = depth
+        self.child = child
+        self.up_dir = up_dir
+        self._mm = None
+
+    @classmethod
+    def build(cls, maze, root: Tuple[int, int]) -> "TreeIndex":
+        core = MazeCore.of(maze)
+        graph = JunctionGraph.build(core, root, root)
+        nodes, target = graph.nodes, graph.target
+        n = len(nodes)
+        if (len(target) - target.count(-1)) // 2 != n - 1:
+            raise ValueError("The spanning-tree index needs a perfect maze (connected, without loops).")
+
+        masks, w = core.masks, core.width
+        steps = (-w, w, -1, 1)
+        depth = array("i", [-1]) * len(masks)
+        child = array("i", [-1]) * len(masks)
+        up_dir = bytearray(len(masks))
+        parent = array("i", [0]) * n
+        hop = array("i", [0]) * n
+
+        root_idx = graph.start_idx
+        root_node = graph.node_of[root_idx]
+        parent[root_node] = root_node
+        depth[root_idx] = 0
+        child[root_idx] = root_node
+        stack = [root_node]
+        while stack:
+            u = stack.pop()
+            base = nodes[u]
+            for d in (0, 1, 2, 3):
+                v = target[4 * u + d]
+                if v == -1 or depth[base + steps[d]] != -1:
+                    continue
+                # walk the corridor down to v, labelling every cell on the way
+                p, move, k = base + steps[d], d, 1
+                goal = nodes[v]
+                while True:
+                    depth[p] = depth[base] + k
+                    child[p] = v
+                    up_dir[p] = OPPOSITE[move] + 1
+                    if p == goal:
+                        break
+                    for move in TURNS[move]:
+                        if masks[p] >> move & 1:
+                            break
+                    p += steps[move]
+                    k += 1
+                parent[v] = u
+                hop[v] = hop[u] + 1
+                stack.append(v)
+        # edges == nodes - 1 only makes a tree if it is connected too: a loop
+        # plus a separate piece passes the count, so every open cell must
+        # have been reached from the root
+        if len(depth) - depth.count(-1) != len(masks) - masks.count(0):
+            raise ValueError("The spanning-tree index needs a perfect maze (connected, without loops).")
+
+        up = [parent]
+        for _ in range(max(hop).bit_length() - 1):
+            prev = up[-1]
+            up.append(array("i", (prev[prev[u]] for u in range(n))))
+        return cls(core.rows, core.cols, root_idx, nodes, hop, up, depth, child, up_dir)
+
+    def _idx(self, cell: Tuple[int, int]) -> int:
+        r, c = cell
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            raise ValueError(f"Cell {cell} is outside the maze.")
+        idx = (r + 1) * self.width + c + 1
+        if self.depth[idx] < 0:
+            raise ValueError(f"Cell {cell} is a wall or not connected to the root.")
+        return idx
+
+    def _lca_node(self, u: int, v: int) -> int:
+        hop, up = self.hop, self.up
+        if hop[u] < hop[v]:
+            u, v = v, u
+        diff, k = hop[u] - hop[v], 0
+        while diff:
+            if diff & 1:
+                u = up[k][u]
+            diff >>= 1
+            k += 1
+        if u == v:
+            return u
+        for k in range(len(up) - 1, -1, -1):
+            if up[k][u] != up[k][v]:
+                u, v = up[k][u], up[k][v]
+        return up[0][u]
+
+    def _lca_idx(self, a: int, b: int) -> int:
+        ca, cb = self.child[a], self.child[b]
+        if ca == cb:
+            # same corridor (or the same node): the shallower cell is the ancestor
+            return a if self.depth[a] <= self.depth[b] else b
+        x = self._lca_node(ca, cb)
+        # a corridor cell sits above its child node, so if that node is an
+        # ancestor of the other cell's node the cell itself is the LCA
+        if x == ca:
+            return a
+        if x == cb:
+            return b
+        return self.node_cells[x]
+
+    def lca(self, a: Tuple[int, int], b: Tuple[int, int]) -> Tuple[int, int]:
+        idx = self._lca_idx(self._idx(a), self._idx(b))
+        return idx // self.width - 1, idx % self.width - 1
+
+    def distance(self, a: Tuple[int, int], b: Tuple[int, int]) -> int:
+        """Number of steps on the unique path between a and b."""
+        ia, ib = self._idx(a), self._idx(b)
+        depth = self.depth
+        return depth[ia] + depth[ib] - 2 * depth[self._lca_idx(ia, ib)]
+
+    def path(self, a: Tuple[int, int], b: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Cells from a to b, both included."""
+        ia, ib = self._idx(a), self._idx(b)
+        lca = self._lca_idx(ia, ib)
+        steps = (-self.width, self.width, -1, 1)
+        up_dir = self.up_dir
+        halves = []
+        for p in (ia, ib):
+            cells = []
+            while p != lca:
+                cells.append(p)
+                p += steps[up_dir[p] - 1]
+            halves.append(cells)
+        cells = halves[0] + [lca] + halves[1][::-1]
+        return [(p // self.width - 1, p % self.width - 1) for p in cells]
+
+    def save(self, path: str, maze_size: int = 0, maze_mtime_ns: int = 0) -> None:
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.rows, self.cols, len(self.hop), len(self.up),
+                                self.root_idx, maze_size, maze_mtime_ns))
+            for arr in (self.node_cells, self.hop, *self.up, self.depth, self.child):
+                f.write(memoryview(arr).cast("B"))
+            f.write(self.up_dir)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["TreeIndex", int, int]:
+        """Map an index file without copying it; return it with the maze size and mtime it was built from.
+
+        The arrays are memoryviews over the mapping, so opening an index for a
+        large maze costs nothing until queries touch its pages.
+        """
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, rows, cols, n, levels, root_idx, size, mtime = HEADER.unpack_from(mm)
+        if magic != MAGIC or version != VERSION:
+            mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} tree index.")
+        cells = (rows + 2) * (cols + 2)
+        if len(mm) != HEADER.size + 4 * n * (2 + levels) + 9 * cells:
+            mm.close()
+            raise ValueError(f"{path} is truncated.")
+        view = memoryview(mm)
+        offset = HEADER.size
+
+        def take(count, fmt="i"):
+            nonlocal offset
+            size = count if fmt == "B" else 4 * count
+            part = view[offset:offset + size].cast(fmt)
+            offset += size
+            return part
+
+        node_cells, hop = take(n), take(n)
+        up = [take(n) for _ in range(levels)]
+        depth, child, up_dir = take(cells), take(cells), take(cells, "B")
+        index = cls(rows, cols, root_idx, node_cells, hop, up, depth, child, up_dir)
+        index._mm = mm
+        return index, size, mtime
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self.node_cells = self.hop = self.up = self.depth = self.child = self.up_dir = None
+            self._mm.close()
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def index_path(maze_path: str) -> str:
+    return maze_path + ".tindex"
+
+
+def load_or_build_index(maze_path: str, maze, root: Tuple[int, int]) -> TreeIndex:
+    """Reuse <maze_path>.tindex when it matches the maze file, else rebuild it."""
+    st = os.stat(maze_path)
+    core = MazeCore.of(maze)
+    root_idx = core.index(root)
+    cached = index_path(maze_path)
+    if os.path.exists(cached):
+        try:
+            index, size, mtime = TreeIndex.load(cached)
+        except (OSError, ValueError, struct.error):
+            index = None
+        if index is not None:
+            if size == st.st_size and mtime == st.st_mtime_ns and index.root_idx == root_idx:
+                return index
+            index.close()
+    index = TreeIndex.build(core, root)
+    try:
+        index.save(cached, st.st_size, st.st_mtime_ns)
+    except OSError:
+        pass
+    return index
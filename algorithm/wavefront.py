@@ -0,0 +1,113 @@
+# wavefront.py
+# Breadth-first search one whole level at a time. With NumPy each level is a
+# handful of array operations on the frontier's flat indices, whatever its
+# size, which pays off on open or braided mazes whose wave is wide. Without
+# NumPy, a queue BFS over the same padded grid gives the same distances.
+# The distance array is the main product: the solver descends it from the
+# exit and it also gives the full distance map used for heatmaps.
+from array import array
+from typing import List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional, the queue BFS below is used instead
+    np = None
+
+from labyrinth.instrument import NULL_TIMER, PhaseTimer
+from labyrinth.maze_core import DOWN, LEFT, OPEN_DIRS, RIGHT, UP, MazeCore
+
+UNREACHED = -1
+
+
+def _wave_numpy(masks: bytearray, w: int, source: int, stop: Optional[int]) -> Tuple[array, bytearray]:
+    open_dirs = np.frombuffer(masks, dtype=np.uint8)
+    dist = np.full(len(masks), UNREACHED, dtype=np.int32)
+    moves = ((UP, -w), (DOWN, w), (LEFT, -1), (RIGHT, 1))
+    frontier = np.array([source], dtype=np.int64)
+    dist[source] = d = 0
+    while frontier.size and (stop is None or dist[stop] == UNREACHED):
+        d += 1
+        # step each frontier cell only through its open sides, as _wave_python does
+        frontier_dirs = open_dirs[frontier]
+        nbrs = np.concatenate([frontier[(frontier_dirs & bit) != 0] + step for bit, step in moves])
+        frontier = np.unique(nbrs[dist[nbrs] == UNREACHED])
+        dist[frontier] = d
+    distances = array("i")
+    distances.frombytes(dist.tobytes())
+    return distances, bytearray((dist != UNREACHED).astype(np.uint8).tobytes())
+
+
+def _wave_python(masks: bytearray, w: int, source: int, stop: Optional[int]) -> Tuple[array, bytearray]:
+    dist = array("i", [UNREACHED]) * len(masks)
+    reached = bytearray(len(masks))
+    steps = (-w, w, -1, 1)
+    open_dirs = OPEN_DIRS
+    queue = array("i", [source])
+    dist[source], reached[source] = 0, 1
+    head = 0
+    while head < len(queue):
+        idx = queue[head]
+        if idx == stop:
+            break
+        head += 1
+        d = dist[idx] + 1
+        for k in open_dirs[masks[idx]]:
+            n = idx + steps[k]
+            if not reached[n]:
+                dist[n], reached[n] = d, 1
+                queue.append(n)
+    return dist, reached
+
+
+def wavefront(maze, source: Tuple[int, int], stop: Optional[Tuple[int, int]] = None) -> Tuple[array, bytearray, int]:
+    """BFS distances from `source` over the padded grid of the maze's core.
+
+    Returns (distances, reached flags, padded width). Distances are -1 for
+    walls and unreached cells. With `stop`, the search ends as soon as that
+    cell's distance is known.
+    """
+    core = MazeCore.of(maze)
+    source_idx = core.index(source)
+    if not core.masks[source_idx]:
+        raise ValueError(f"Source {source} is not an open cell.")
+    stop_idx = None if stop is None else core.index(stop)
+    wave = _wave_python if np is None else _wave_numpy
+    dist, reached = wave(core.masks, core.width, source_idx, stop_idx)
+    return dist, reached, core.width
+
+
+def distance_map(maze, source: Tuple[int, int]) -> array:
+    """Distance of every cell from `source`, row-major rows*cols, -1 where unreachable."""
+    core = MazeCore.of(maze)
+    rows, cols = core.rows, core.cols
+    dist, _, w = wavefront(core, source)
+    out = array("i")
+    for r in range(1, rows + 1):
+        out.extend(dist[r * w + 1:r * w + 1 + cols])
+    return out
+
+
+def wavefront_solver(maze, start: Tuple[int, int], end: Tuple[int, int],
+                     timer: PhaseTimer = NULL_TIMER) -> Optional[Tuple[List[Tuple[int, int]], Set[Tuple[int, int]]]]:
+    """Shortest path by wavefront BFS from start, descending the distances from end."""
+    with timer.phase("search"):
+        core = MazeCore.of(maze)
+        dist, reached, w = wavefront(core, start, end)
+    end_idx = core.index(end)
+    if dist[end_idx] == UNREACHED:
+        return None
+    with timer.phase("reconstruct"):
+        steps = (-w, w, -1, 1)
+        idx = end_idx
+        cells = [idx]
+        for d in range(dist[end_idx] - 1, -1, -1):
+            for step in steps:
+                if dist[idx + step] == d:
+                    idx += step
+                    break
+            cells.append(idx)
+        cells.reverse()
+        path = core.cells(cells)
+        explored = core.cell_set(reached)
+    timer.count("nodes_explored", len(explored))
+    return path, explored
@@ -0,0 +1,5 @@
+import sys
+
+from amazing_mazes.cli import main
+
+sys.exit(main())
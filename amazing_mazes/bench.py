@@ -0,0 +1,121 @@
+# bench.py
+# Reproducible benchmarks for the generators and solvers: fixed sizes and
+# seeds, warmup + repeated timings, tracemalloc peak from a separate run (so
+# tracing overhead never leaks into the timings), JSON output and a
+# comparison against a stored baseline.
+import contextlib
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from labyrinth.grid import add_entrance_exit, grid_to_text
+from amazing_mazes.cli import GENERATORS, SOLVERS
+
+DEFAULT_SIZES = [51, 251, 1001]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    # nearest-rank percentile, stable for the small sample counts used here
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def measure(fn: Callable[[], object], repeats: int, warmup: int, memory: bool) -> dict:
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(warmup):
+            fn()
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        peak_mb = None
+        if memory:
+            tracemalloc.start()
+            fn()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 10**6
+            tracemalloc.stop()
+    times.sort()
+    return {"times": times, "median": statistics.median(times), "p95": percentile(times, 95),
+            "min": times[0], "peak_mb": peak_mb}
+
+
+def prepare_maze(size: int, seed: int, maze_algo: str = "dfs") -> List[str]:
+    grid = GENERATORS[maze_algo](size, seed)
+    add_entrance_exit(grid, size)
+    return grid_to_text(grid, size).split("\n")
+
+
+def run_benchmarks(sizes: List[int] = DEFAULT_SIZES, generators: Optional[List[str]] = None,
+                   solvers: Optional[List[str]] = None, seeds: List[int] = (1,), repeats: int = 5,
+                   warmup: int = 1, memory: bool = True, maze_algo: str = "dfs", progress: bool = True) -> dict:
+    generators = list(GENERATORS) if generators is None else generators
+    solvers = list(SOLVERS) if solvers is None else solvers
+    results = []
+
+    def record(kind, algo, size, seed, stats):
+        results.append({"kind": kind, "algorithm": algo, "size": size, "seed": seed, **stats})
+        if progress:
+            peak = f", peak {stats['peak_mb']:.2f}MB" if stats["peak_mb"] is not None else ""
+            print(f"{kind:8} {algo:12} size {size:5} seed {seed}: "
+                  f"median {stats['median']:.4f}s, p95 {stats['p95']:.4f}s{peak}")
+
+    for size in sizes:
+        for seed in seeds:
+            for algo in generators:
+                stats = measure(lambda: GENERATORS[algo](size, seed), repeats, warmup, memory)
+                record("generate", algo, size, seed, stats)
+            if not solvers:
+                continue
+            maze = prepare_maze(size, seed, maze_algo)
+            start, end = (0, maze[0].index(".")), (size - 1, maze[-1].index("."))
+            for algo in solvers:
+                stats = measure(lambda: SOLVERS[algo](maze, start, end), repeats, warmup, memory)
+                record("solve", algo, size, seed, stats)
+
+    return {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeats": repeats,
+            "warmup": warmup,
+            "maze_algorithm": maze_algo,
+        },
+        "results": results,
+    }
+
+
+def result_key(result: dict):
+    return result["kind"], result["algorithm"], result["size"], result["seed"]
+
+
+def compare_to_baseline(current: dict, baseline: dict, threshold: float = 0.10) -> List[dict]:
+    """Return the cases whose median time grew by more than `threshold` (0.10 = 10%)."""
+    base = {result_key(r): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = base.get(result_key(result))
+        if old is None or not old["median"]:
+            continue
+        ratio = result["median"] / old["median"]
+        if ratio > 1 + threshold:
+            regressions.append({"kind": result["kind"], "algorithm": result["algorithm"],
+                                "size": result["size"], "seed": result["seed"],
+                                "baseline": old["median"], "current": result["median"], "ratio": ratio})
+    return regressions
+
+
+def save_results(results: dict, path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
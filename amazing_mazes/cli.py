@@ -0,0 +1,488 @@
+# cli.py
+# Non-interactive entry point: python -m amazing_mazes generate|solve|materialize|query|heatmap|serve|loadtest|bench|importtime ...
+import argparse
+import os
+import random
+import sys
+import time
+from typing import TYPE_CHECKING, List, Optional
+
+from labyrinth.generate import maze_rows
+from labyrinth.grid import check_size, write_rows_text
+from labyrinth.instrument import MEMORY_MODES
+from labyrinth.maze_format import MAGIC, write_maze_binary
+from labyrinth.registry import GENERATORS, RENDERERS, SOLVERS
+
+if TYPE_CHECKING:
+    from algorithm.result_cache import ResultCache
+
+# algorithm.result_cache.DEFAULT_DIR, spelled out so building the parser does
+# not import the cache (and json) for commands that never solve anything
+CACHE_DIR = "labyrinth/solve_cache"
+
+
+def maze_stem(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def read_stdin_maze(directory: str) -> str:
+    """Copy the maze piped on stdin into `directory` and return the file's path.
+
+    The solvers need a real file: the cache hashes it, the junction graph is
+    saved next to it and a .maze file is memory-mapped.
+    """
+    data = sys.stdin.buffer.read()
+    path = os.path.join(directory, "stdin.maze" if data.startswith(MAGIC) else "stdin.txt")
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def render_image(maze_path: str, image: str, cell_size: int) -> str:
+    image_path = f"{os.path.splitext(maze_path)[0]}.{image}"
+    RENDERERS["image"](maze_path, image_path, cell_size)
+    return image_path
+
+
+def job_seeds(count: int, seed: Optional[int] = None) -> List[int]:
+    """Seeds for a run of `count` mazes: seed, seed + 1, ...
+
+    Without a seed a random base is drawn, so every maze still gets a seed
+    that is recorded in its file name and can be regenerated later.
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**31)
+    return [seed + i for i in range(count)]
+
+
+def maze_path(out_dir: str, algo: str, size: int, seed: int, fmt: str, height: Optional[int] = None) -> str:
+    shape = size if height is None or height == size else f"{size}x{height}"
+    return os.path.join(out_dir, f"{algo}_{shape}_{seed}.{fmt}")
+
+
+def generate_maze(algo: str, size: int, seed: Optional[int], path: str, height: Optional[int] = None) -> None:
+    """Generate one maze into `path` (.maze binary, text otherwise, "-" for text on stdout)."""
+    rows = maze_rows(algo, size, seed, height)
+    if path == "-":
+        write_rows_text(rows, sys.stdout.buffer)
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.buffer.flush()
+    elif path.endswith(".maze"):
+        write_maze_binary(path, rows, algo, seed)
+    else:
+        with open(path, "wb") as file:
+            write_rows_text(rows, file)
+
+
+def generate_mazes(algo: str, size: int, out_dir: str, count: int = 1, seed: Optional[int] = None,
+                   fmt: str = "txt", image: Optional[str] = None, cell_size: int = 20,
+                   height: Optional[int] = None) -> List[str]:
+    """Generate `count` mazes into out_dir and return their paths.
+
+    Maze i uses seed + i (see job_seeds), so every file can be regenerated on
+    its own.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for maze_seed in job_seeds(count, seed):
+        path = maze_path(out_dir, algo, size, maze_seed, fmt, height)
+        start = time.perf_counter()
+        generate_maze(algo, size, maze_seed, path, height)
+        print(f"{path}: generated in {time.perf_counter() - start:.4f} seconds.")
+        if image:
+            render_image(path, image, cell_size)
+        paths.append(path)
+    return paths
+
+
+def algorithm_list(algo: str) -> List[str]:
+    # "both" is the two cell-by-cell solvers, "all" adds every other solver
+    if algo == "both":
+        return ["astar", "backtracking"]
+    if algo == "all":
+        return list(SOLVERS)
+    return [algo]
+
+
+def solve_file(path: str, algo: str, out_dir: Optional[str] = None, memory: str = "none",
+               cache: Optional["ResultCache"] = None) -> dict:
+    from algorithm.solve import solve_path
+    solution_path = None
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+        solution_path = os.path.join(out_dir, f"{maze_stem(path)}_solution_{algo}.txt")
+    return solve_path(path, algo, solution_path, memory, cache).as_dict()
+
+
+def solve_mazes(paths: List[str], algo: str, out_dir: Optional[str] = None,
+                image: Optional[str] = None, cell_size: int = 20, memory: str = "none",
+                cache: Optional["ResultCache"] = None) -> List[dict]:
+    algos = algorithm_list(algo)
+    records = []
+    for path in paths:
+        for name in algos:
+            try:
+                record = solve_file(path, name, out_dir, memory, cache)
+            except (OSError, ValueError) as e:
+                record = {"maze": path, "algorithm": name, "status": "error", "error": str(e)}
+            if image and record.get("solution"):
+                record["image"] = render_image(record["solution"], image, cell_size)
+            line = f"{path} [{name}]: {record['status']}"
+            if record["status"] == "solved":
+                line += f", path {record['path_length']}, explored {record['nodes_explored']}, "
+                if record.get("counters", {}).get("cache_hit"):
+                    line += f"from the result cache, total {record['total_time']:.4f}s"
+                else:
+                    line += f"search {record['time']:.4f}s, total {record['total_time']:.4f}s"
+                if record["peak_rss_mb"] is not None:
+                    line += f", peak RSS {record['peak_rss_mb']:.1f}MB"
+                if record["traced_peak_mb"] is not None:
+                    line += f", traced peak {record['traced_peak_mb']:.2f}MB"
+            elif "error" in record:
+                line += f" ({record['error']})"
+            print(line)
+            records.append(record)
+    return records
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="amazing_mazes", description="Generate and solve mazes without prompts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="generate maze files")
+    gen.add_argument("--algo", choices=sorted(GENERATORS), default="dfs")
+    gen.add_argument("--size", type=int, required=True, help="odd maze size (>= 3)")
+    gen.add_argument("--height", type=int, default=None,
+                     help="odd number of rows if different from --size (streaming generators only)")
+    gen.add_argument("--seed", type=int, default=None, help="seed of the first maze, the next ones use seed+1, ...")
+    gen.add_argument("--count", type=int, default=1)
+    gen.add_argument("--out", default="labyrinth/generated_maze", help="output folder, or - for one text maze on stdout")
+    gen.add_argument("--format", choices=("txt", "maze"), default="txt")
+    gen.add_argument("--image", choices=("jpg", "png"), default=None, help="also render each maze as an image")
+    gen.add_argument("--cell-size", type=int, default=20)
+    gen.add_argument("--workers", type=int, default=1, help="worker processes, 0 = one per CPU")
+    gen.add_argument("--store", default=None,
+                     help="only record (algo, size, seed, version) in this .json store, see materialize")
+
+    solve = sub.add_parser("solve", help="solve maze files")
+    solve.add_argument("mazes", nargs="+", help=".txt or .maze files, - for one maze on stdin")
+    solve.add_argument("--algo", choices=sorted(SOLVERS) + ["both", "all"], default="astar")
+    solve.add_argument("--out", default=None, help="write <maze>_solution_<algo>.txt files here")
+    solve.add_argument("--image", choices=("jpg", "png"), default=None, help="also render each solution (needs --out)")
+    solve.add_argument("--cell-size", type=int, default=20)
+    solve.add_argument("--memory", choices=MEMORY_MODES, default="none",
+                       help="rss = sampled peak RSS, tracemalloc = exact but slow (not in batch mode)")
+    solve.add_argument("--workers", type=int, default=None, help="solve in separate processes, 0 = one per CPU")
+    solve.add_argument("--timeout", type=float, default=None, help="seconds allowed per solve (batch mode)")
+    solve.add_argument("--memory-mb", type=int, default=None, help="memory cap per solve (batch mode)")
+    solve.add_argument("--summary", default=None, help="write one record per solve to this .csv or .jsonl file")
+    solve.add_argument("--cache", nargs="?", const=CACHE_DIR, default=None, metavar="DIR",
+                       help=f"reuse results for mazes already solved (default folder {CACHE_DIR})")
+    solve.add_argument("--cache-mb", type=int, default=256, help="disk budget of the result cache")
+
+    mat = sub.add_parser("materialize", help="rebuild mazes recorded in a store")
+    mat.add_argument("store", help=".json store written by generate --store")
+    mat.add_argument("ids", nargs="*", help="maze ids or ranges like 10-19 (default: all)")
+    mat.add_argument("--list", action="store_true", help="print the records instead of writing mazes")
+    mat.add_argument("--out", default="labyrinth/generated_maze", help="output folder")
+    mat.add_argument("--format", choices=("txt", "maze"), default="txt")
+    mat.add_argument("--image", choices=("jpg", "png"), default=None, help="also render each maze as an image")
+    mat.add_argument("--cell-size", type=int, default=20)
+
+    query = sub.add_parser("query", help="distances or paths between cells of a perfect maze")
+    query.add_argument("maze", help=".txt or .maze file, indexed once into <maze>.tindex")
+    query.add_argument("pairs", nargs="+", help="cell pairs as ROW,COL:ROW,COL")
+    query.add_argument("--path", action="store_true", help="print the cells of each path too")
+
+    heatmap = sub.add_parser("heatmap", help="render the distance map of a maze as an image")
+    heatmap.add_argument("maze", help=".txt or .maze file")
+    heatmap.add_argument("image", help="output .png, .gif, .bmp or .jpg")
+    heatmap.add_argument("--source", default="exit", help="'exit', 'entrance' or a cell as ROW,COL")
+    heatmap.add_argument("--cell-size", type=int, default=4)
+
+    serve = sub.add_parser("serve", help="run the maze service (HTTP on TCP or a Unix socket)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--unix", default=None, help="listen on this Unix socket instead of TCP")
+    serve.add_argument("--workers", type=int, default=0, help="worker processes, 0 = one per CPU")
+    serve.add_argument("--batch-ms", type=float, default=2.0, help="how long a solve waits for others on its maze")
+
+    load = sub.add_parser("loadtest", help="measure throughput and latency of a running service")
+    load.add_argument("--host", default="127.0.0.1")
+    load.add_argument("--port", type=int, default=8765)
+    load.add_argument("--unix", default=None)
+    load.add_argument("--requests", type=int, default=1000)
+    load.add_argument("--concurrency", type=int, default=16)
+    load.add_argument("--mode", choices=("solve", "distance"), default="solve")
+    load.add_argument("--algo", nargs="+", choices=sorted(SOLVERS), default=["astar"])
+    load.add_argument("--mazes", type=int, default=1, help="distinct mazes to spread the requests over")
+    load.add_argument("--size", type=int, default=201)
+    load.add_argument("--generator", choices=sorted(GENERATORS), default="kruskal")
+    load.add_argument("--seed", type=int, default=1)
+    load.add_argument("--pairs", type=int, default=1, help="cell pairs per distance request")
+
+    bench = sub.add_parser("bench", help="benchmark generators and solvers")
+    bench.add_argument("--sizes", type=int, nargs="+", default=[51, 251, 1001])
+    bench.add_argument("--generators", nargs="*", choices=sorted(GENERATORS), default=None)
+    bench.add_argument("--solvers", nargs="*", choices=sorted(SOLVERS), default=None)
+    bench.add_argument("--seeds", type=int, nargs="+", default=[1])
+    bench.add_argument("--repeats", type=int, default=5)
+    bench.add_argument("--warmup", type=int, default=1)
+    bench.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak run")
+    bench.add_argument("--out", default=None, help="save results as JSON")
+    bench.add_argument("--baseline", default=None, help="JSON results to compare against")
+    bench.add_argument("--threshold", type=float, default=0.10, help="allowed median slowdown, 0.10 = 10%%")
+
+    imports = sub.add_parser("importtime", help="check the start-up import time of the entry points")
+    imports.add_argument("modules", nargs="*", default=None, help="modules to import (default: main amazing_mazes.cli)")
+    imports.add_argument("--budget-ms", type=float, default=None, help="allowed median import time per module (default 80)")
+    imports.add_argument("--repeats", type=int, default=5)
+    return parser
+
+
+def parse_pair(text: str):
+    try:
+        a, b = text.split(":")
+        return tuple(int(v) for v in a.split(",")), tuple(int(v) for v in b.split(","))
+    except ValueError:
+        raise ValueError(f"Bad cell pair {text!r}, expected ROW,COL:ROW,COL.") from None
+
+
+def run_query(args) -> int:
+    from algorithm.tree_index import load_or_build_index
+    from labyrinth.maze_core import MazeCore
+    try:
+        pairs = [parse_pair(p) for p in args.pairs]
+        core = MazeCore.load(args.maze)
+        if core.entrance is None:
+            raise ValueError(f"{args.maze} has no entrance to root the index at.")
+        index = load_or_build_index(args.maze, core, core.entrance)
+        with index:
+            for a, b in pairs:
+                print(f"{a} -> {b}: distance {index.distance(a, b)}")
+                if args.path:
+                    print(" ".join(f"{r},{c}" for r, c in index.path(a, b)))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+def run_heatmap(args) -> int:
+    from algorithm.wavefront import distance_map
+    from labyrinth.maze_core import MazeCore
+    try:
+        core = MazeCore.load(args.maze)
+        if args.source in ("entrance", "exit"):
+            source = core.exit if args.source == "exit" else core.entrance
+            if source is None:
+                raise ValueError(f"{args.maze} has no {args.source}.")
+        else:
+            source = tuple(int(v) for v in args.source.split(","))
+        distances, cols = distance_map(core, source), core.cols
+        RENDERERS["heatmap"](distances, cols, args.image, args.cell_size)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+def parse_ids(specs: List[str], total: int) -> List[int]:
+    ids = []
+    try:
+        for spec in specs:
+            first, _, last = spec.partition("-")
+            ids.extend(range(int(first), int(last or first) + 1))
+    except ValueError:
+        raise ValueError(f"Bad maze id {spec!r}, expected N or N-M.") from None
+    return ids if specs else list(range(total))
+
+
+def run_store(args) -> int:
+    from labyrinth.maze_store import MazeStore
+    try:
+        store = MazeStore(args.store)
+        ids = store.add(args.algo, args.size, job_seeds(1, args.seed)[0], args.count, args.height)
+        store.save()
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(f"{args.store}: recorded mazes {ids.start}-{ids.stop - 1} ({len(store)} in the store).")
+    return 0
+
+
+def run_materialize(args) -> int:
+    from labyrinth.maze_store import MazeStore
+    try:
+        store = MazeStore(args.store)
+        ids = parse_ids(args.ids, len(store))
+        if args.list:
+            for i in ids:
+                r = store.record(i)
+                print(f"{i}: {r.name} ({r.version})")
+            return 0
+        os.makedirs(args.out, exist_ok=True)
+        for i in ids:
+            path = os.path.join(args.out, f"{store.record(i).name}.{args.format}")
+            start = time.perf_counter()
+            store.export(i, path)
+            print(f"{path}: rebuilt in {time.perf_counter() - start:.4f} seconds.")
+            if args.image:
+                render_image(path, args.image, args.cell_size)
+    except (OSError, ValueError, IndexError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+def run_serve(args) -> int:
+    import asyncio
+    from amazing_mazes.service import serve
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers or None, args.batch_ms / 1000))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+def run_loadtest(args) -> int:
+    import asyncio
+    from amazing_mazes.loadtest import format_report, run_load
+    try:
+        check_size(args.size)
+        result = asyncio.run(run_load(args.requests, args.concurrency, args.mode, tuple(args.algo),
+                                      args.mazes, args.size, args.generator, args.seed, args.pairs,
+                                      args.host, args.port, args.unix))
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(format_report(result))
+    return 0 if not result["errors"] else 1
+
+
+def run_bench(args) -> int:
+    from amazing_mazes.bench import compare_to_baseline, load_results, run_benchmarks, save_results
+    results = run_benchmarks(args.sizes, args.generators, args.solvers, args.seeds,
+                             args.repeats, args.warmup, not args.no_memory)
+    if args.out:
+        save_results(results, args.out)
+        print(f"Results saved in {args.out}")
+    if args.baseline:
+        regressions = compare_to_baseline(results, load_results(args.baseline), args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['kind']} {r['algorithm']} size {r['size']} seed {r['seed']}: "
+                  f"{r['baseline']:.4f}s -> {r['current']:.4f}s (x{r['ratio']:.2f})")
+        if regressions:
+            return 1
+        print(f"No regression above {args.threshold:.0%} against {args.baseline}.")
+    return 0
+
+
+def run_importtime(args) -> int:
+    from amazing_mazes.importtime import DEFAULT_BUDGET_MS, check_imports
+    budget = args.budget_ms or DEFAULT_BUDGET_MS
+    try:
+        results = check_imports(args.modules, budget, args.repeats)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    failed = False
+    for r in results:
+        print(f"{r['module']}: {r['ms']:.1f}ms (budget {budget:.0f}ms)")
+        if r["over_budget"]:
+            print(f"REGRESSION {r['module']}: {r['ms']:.1f}ms over the {budget:.0f}ms budget")
+        if r["heavy"]:
+            print(f"REGRESSION {r['module']} imports {', '.join(r['heavy'])} at start-up")
+        failed |= r["over_budget"] or bool(r["heavy"])
+    return 1 if failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the CLI and return the exit code.
+
+    0 on success, 1 if any maze could not be solved or read, 2 on bad arguments.
+    A reader that closes the pipe early (`| head`) is not an error.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        code = run_command(parser, args)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Python flushes stdout again at exit; point it at devnull so that
+        # flush does not raise a second time
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    return code
+
+
+def run_command(parser: argparse.ArgumentParser, args) -> int:
+    if args.command == "generate":
+        if args.count < 1:
+            parser.error("--count must be at least 1")
+        if args.out == "-" and (args.count != 1 or args.image or args.format != "txt"):
+            parser.error("--out - writes a single text maze, without --count, --image or --format maze")
+        if args.store:
+            return run_store(args)
+        try:
+            check_size(args.size)
+            if args.out == "-":
+                generate_maze(args.algo, args.size, job_seeds(1, args.seed)[0], "-", args.height)
+            elif args.workers == 1:
+                generate_mazes(args.algo, args.size, args.out, args.count, args.seed,
+                               args.format, args.image, args.cell_size, args.height)
+            else:
+                from amazing_mazes.parallel import generate_corpus
+                generate_corpus(args.algo, args.size, args.out, args.count, args.seed,
+                                args.format, args.workers or None, args.image, args.cell_size,
+                                height=args.height)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+        return 0
+
+    if args.command == "bench":
+        return run_bench(args)
+
+    if args.command == "importtime":
+        return run_importtime(args)
+
+    if args.command == "query":
+        return run_query(args)
+
+    if args.command == "materialize":
+        return run_materialize(args)
+
+    if args.command == "serve":
+        return run_serve(args)
+
+    if args.command == "loadtest":
+        return run_loadtest(args)
+
+    if args.command == "heatmap":
+        return run_heatmap(args)
+
+    if args.image and args.out is None:
+        parser.error("--image needs --out")
+    if args.mazes.count("-") > 1:
+        parser.error("stdin (-) can only be given once")
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [read_stdin_maze(tmp) if path == "-" else path for path in args.mazes]
+        if args.workers is not None or args.timeout or args.memory_mb or args.summary:
+            if args.image:
+                parser.error("--image is not supported in batch mode")
+            from amazing_mazes.parallel import solve_batch
+            algos = algorithm_list(args.algo)
+            records = solve_batch(paths, algos, args.workers or None, args.timeout,
+                                  args.memory_mb, args.summary, args.out,
+                                  cache_dir=args.cache, cache_mb=args.cache_mb)
+        else:
+            from algorithm.result_cache import ResultCache
+            cache = ResultCache(args.cache, args.cache_mb * 2**20) if args.cache else None
+            records = solve_mazes(paths, args.algo, args.out, args.image, args.cell_size, args.memory, cache)
+    return 0 if all(r["status"] == "solved" for r in records) else 1
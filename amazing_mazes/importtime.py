@@ -0,0 +1,59 @@
+# importtime.py
+# Start-up budget for the entry points: python -m amazing_mazes importtime
+# Imports each module in a fresh interpreter under `python -X importtime`,
+# takes the median cumulative time over a few runs and lists any heavy
+# module (Pillow, NumPy, the solvers, ...) that got imported on the way, so
+# a top-level import that undoes the lazy loading fails the check.
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+DEFAULT_MODULES = ["main", "amazing_mazes.cli"]
+DEFAULT_BUDGET_MS = 80.0
+# Loaded on demand only: renderers, optional numerics, instrumentation,
+# the service stack and the solvers themselves
+HEAVY_MODULES = ("PIL", "numpy", "tracemalloc", "asyncio", "multiprocessing",
+                 "algorithm", "labyrinth.lab_to_jpg", "labyrinth.tiles")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Cumulative microseconds per module from `-X importtime` output."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure_import(module: str, repeats: int = 5) -> dict:
+    """Median import time of `module` in ms and the heavy modules it pulled in."""
+    samples = []
+    loaded: Dict[str, int] = {}
+    for _ in range(repeats):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              cwd=ROOT, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+        loaded = parse_importtime(proc.stderr)
+        samples.append(loaded[module] / 1000)
+    heavy = sorted(name for name in loaded
+                   if any(name == h or name.startswith(h + ".") for h in HEAVY_MODULES))
+    return {"module": module, "ms": statistics.median(samples), "heavy": heavy}
+
+
+def check_imports(modules: Optional[List[str]] = None, budget_ms: float = DEFAULT_BUDGET_MS,
+                  repeats: int = 5) -> List[dict]:
+    """Measure every module; each result says whether it is over budget or imports heavy modules."""
+    results = []
+    for module in modules or DEFAULT_MODULES:
+        result = measure_import(module, repeats)
+        result["over_budget"] = result["ms"] > budget_ms
+        results.append(result)
+    return results
@@ -0,0 +1,128 @@
+# loadtest.py
+# Load-test client for the maze service: python -m amazing_mazes loadtest
+# Opens `concurrency` keep-alive connections, registers the mazes to hit,
+# then sends solve or distance requests as fast as the server answers and
+# reports requests per second and latency percentiles.
+import asyncio
+import json
+import random
+import time
+from typing import List, Optional, Tuple
+
+
+class ServiceClient:
+    """One keep-alive HTTP/1.1 connection to the service, JSON in and out."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, unix: Optional[str] = None):
+        self.host, self.port, self.unix = host, port, unix
+        self._reader = self._writer = None
+
+    async def connect(self) -> "ServiceClient":
+        if self.unix:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.unix)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        return self
+
+    async def request(self, method: str, path: str, payload: Optional[dict] = None) -> Tuple[int, dict]:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self._writer.write((f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                            "Content-Type: application/json\r\n"
+                            f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+        await self._writer.drain()
+        status = int((await self._reader.readline()).split()[1])
+        length = 0
+        while True:
+            header = await self._reader.readline()
+            if header in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = header.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self._reader.readexactly(length))
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def run_load(requests: int = 1000, concurrency: int = 16, mode: str = "solve",
+                   algos: Tuple[str, ...] = ("astar",), mazes: int = 1, size: int = 201,
+                   generator: str = "kruskal", seed: int = 1, pairs: int = 1,
+                   host: str = "127.0.0.1", port: int = 8765, unix: Optional[str] = None) -> dict:
+    """Send `requests` requests over `concurrency` connections and return the measurements.
+
+    mode "solve" asks for entrance-to-exit solves with the given algorithms;
+    mode "distance" asks for the way from `pairs` random cells to the exit,
+    so batched requests share the exit's distance field.
+    """
+    setup = await ServiceClient(host, port, unix).connect()
+    maze_ids, shapes, exits = [], [], []
+    for i in range(mazes):
+        status, info = await setup.request("POST", "/mazes", {"algo": generator, "size": size, "seed": seed + i})
+        if status != 200:
+            raise RuntimeError(f"Registering a maze failed: {info.get('error')}")
+        maze_ids.append(info["maze"])
+        shapes.append((info["rows"], info["cols"]))
+        exits.append(info["exit"])
+    before = (await setup.request("GET", "/health"))[1]
+
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors = 0
+    sent = 0
+
+    def next_payload() -> Tuple[str, dict]:
+        k = rng.randrange(len(maze_ids))
+        if mode == "solve":
+            return "/solve", {"maze": maze_ids[k], "algo": rng.choice(algos)}
+        rows, cols = shapes[k]
+        # odd (row, col) are always open cells in generated mazes
+        cell = lambda: (rng.randrange(1, rows - 1, 2), rng.randrange(1, cols - 1, 2))
+        return "/distance", {"maze": maze_ids[k], "pairs": [[cell(), exits[k]] for _ in range(pairs)]}
+
+    async def worker() -> None:
+        nonlocal errors, sent
+        client = await ServiceClient(host, port, unix).connect()
+        try:
+            while sent < requests:
+                sent += 1
+                path, payload = next_payload()
+                t = time.perf_counter()
+                status, _ = await client.request("POST", path, payload)
+                latencies.append(time.perf_counter() - t)
+                if status != 200:
+                    errors += 1
+        finally:
+            await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    after = (await setup.request("GET", "/health"))[1]
+    await setup.close()
+
+    latencies.sort()
+    jobs = "solve_jobs" if mode == "solve" else "distance_jobs"
+    return {
+        "requests": len(latencies), "errors": errors, "wall": wall,
+        "rps": len(latencies) / wall if wall else 0.0,
+        "p50": percentile(latencies, 0.50), "p90": percentile(latencies, 0.90),
+        "p99": percentile(latencies, 0.99), "max": latencies[-1] if latencies else 0.0,
+        "jobs": after[jobs] - before[jobs],
+    }
+
+
+def format_report(result: dict) -> str:
+    return (f"{result['requests']} requests in {result['wall']:.2f}s: {result['rps']:.0f} req/s, "
+            f"{result['errors']} errors\n"
+            f"latency p50 {result['p50'] * 1000:.2f}ms, p90 {result['p90'] * 1000:.2f}ms, "
+            f"p99 {result['p99'] * 1000:.2f}ms, max {result['max'] * 1000:.2f}ms\n"
+            f"{result['jobs']} worker jobs ({result['requests'] / max(result['jobs'], 1):.1f} requests per job)")
@@ -0,0 +1,198 @@
+# parallel.py
+# Bulk generation and solving spread over worker processes. Every job is
+# fully described by a few small values, so workers read and write their own
+# files and only small result records travel back to the parent process.
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from typing import List, Optional, Tuple
+
+from algorithm.result_cache import ResultCache
+from amazing_mazes.cli import generate_maze, job_seeds, maze_path, render_image, solve_file
+
+try:
+    import resource
+except ImportError:  # not available on Windows, memory caps are then skipped
+    resource = None
+
+SUMMARY_FIELDS = ["maze", "algorithm", "status", "path_length", "nodes_explored", "time", "peak_rss_mb", "error"]
+
+
+def _generate_job(job: Tuple[str, int, int, str, Optional[str], int, Optional[int]]) -> Tuple[str, int, float]:
+    algo, size, seed, path, image, cell_size, height = job
+    start = time.perf_counter()
+    generate_maze(algo, size, seed, path, height)
+    elapsed = time.perf_counter() - start
+    if image:
+        render_image(path, image, cell_size)
+    return path, seed, elapsed
+
+
+def generate_corpus(algo: str, size: int, out_dir: str, count: int, seed: Optional[int] = None,
+                    fmt: str = "txt", workers: Optional[int] = None, image: Optional[str] = None,
+                    cell_size: int = 20, progress: bool = True, height: Optional[int] = None) -> dict:
+    """Generate `count` mazes with a ProcessPoolExecutor and return a summary.
+
+    Seeds follow job_seeds(), so the same (seed, count) gives the same files
+    whatever the number of workers. Jobs are handed out in chunks to keep the
+    per-maze IPC cost small when mazes are tiny.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    jobs = [(algo, size, s, maze_path(out_dir, algo, size, s, fmt, height), image, cell_size, height)
+            for s in job_seeds(count, seed)]
+    chunksize = max(1, count // (workers * 8))
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for done, (path, job_seed, elapsed) in enumerate(executor.map(_generate_job, jobs, chunksize=chunksize), 1):
+            results.append({"path": path, "seed": job_seed, "time": elapsed})
+            if progress:
+                print(f"[{done}/{count}] {path}: generated in {elapsed:.4f} seconds.")
+    wall = time.perf_counter() - start
+
+    times = sorted(r["time"] for r in results)
+    summary = {
+        "algorithm": algo,
+        "size": size,
+        "count": count,
+        "workers": workers,
+        "wall_time": wall,
+        "total_job_time": sum(times),
+        "mean_job_time": sum(times) / count,
+        "max_job_time": times[-1],
+        # total_job_time / wall_time, close to `workers` when scaling is linear
+        "speedup": sum(times) / wall if wall else 0.0,
+        "mazes": results,
+    }
+    if progress:
+        print(f"{count} mazes in {wall:.2f}s with {workers} workers "
+              f"(mean {summary['mean_job_time']:.4f}s per maze, speedup x{summary['speedup']:.2f}).")
+    return summary
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is in KB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 10**6
+
+
+def _solve_worker(conn, path: str, algo: str, out_dir: Optional[str], memory_mb: Optional[int],
+                  cache_dir: Optional[str] = None, cache_mb: int = 256) -> None:
+    sys.stdout = open(os.devnull, "w")
+    if memory_mb and resource is not None:
+        limit = memory_mb * 2**20
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    try:
+        # workers share the disk tier; entries are written atomically
+        cache = ResultCache(cache_dir, cache_mb * 2**20) if cache_dir else None
+        record = solve_file(path, algo, out_dir, cache=cache)
+    except MemoryError:
+        record = {"maze": path, "algorithm": algo, "status": "memory_exceeded"}
+    except Exception as e:
+        record = {"maze": path, "algorithm": algo, "status": "error", "error": f"{type(e).__name__}: {e}"}
+    record["peak_rss_mb"] = _peak_rss_mb()
+    conn.send(record)
+    conn.close()
+
+
+class _SummaryWriter:
+    def __init__(self, path: Optional[str]):
+        self.file = open(path, "w", newline="") if path else None
+        self.csv = None
+        if self.file and path.endswith(".csv"):
+            self.csv = csv.DictWriter(self.file, fieldnames=SUMMARY_FIELDS, extrasaction="ignore")
+            self.csv.writeheader()
+
+    def write(self, record: dict) -> None:
+        if self.file is None:
+            return
+        if self.csv:
+            self.csv.writerow(record)
+        else:
+            self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.file:
+            self.file.close()
+
+
+def solve_batch(mazes: List[str], algos: List[str], workers: Optional[int] = None,
+                timeout: Optional[float] = None, memory_mb: Optional[int] = None,
+                summary_path: Optional[str] = None, out_dir: Optional[str] = None,
+                progress: bool = True, cache_dir: Optional[str] = None, cache_mb: int = 256) -> List[dict]:
+    """Solve every (maze, algorithm) pair in its own process and return the records.
+
+    Each job gets `timeout` seconds of wall-clock time and an address-space
+    cap of `memory_mb`; a job over time is terminated and recorded as
+    "timeout", one that runs out of memory as "memory_exceeded" (or "crashed"
+    if the OS killed it). Records are appended to summary_path (.csv, else
+    JSONL) as soon as each job finishes, so a long batch can be followed live.
+    """
+    workers = workers or os.cpu_count() or 1
+    pending = deque((path, algo) for path in mazes for algo in algos)
+    total = len(pending)
+    running = {}
+    records = []
+    writer = _SummaryWriter(summary_path)
+
+    def finish(record):
+        records.append(record)
+        writer.write(record)
+        if progress:
+            line = f"[{len(records)}/{total}] {record['maze']} [{record['algorithm']}]: {record['status']}"
+            if record["status"] == "solved":
+                line += f", path {record['path_length']}, "
+                line += "from the result cache" if record.get("counters", {}).get("cache_hit") else f"{record['time']:.4f}s"
+            print(line)
+
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                path, algo = pending.popleft()
+                recv_conn, send_conn = Pipe(duplex=False)
+                proc = Process(target=_solve_worker, args=(send_conn, path, algo, out_dir, memory_mb, cache_dir, cache_mb), daemon=True)
+                proc.start()
+                send_conn.close()
+                deadline = time.monotonic() + timeout if timeout else None
+                running[recv_conn] = (proc, path, algo, time.monotonic(), deadline)
+
+            deadlines = [job[4] for job in running.values() if job[4] is not None]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            for conn in wait(list(running), timeout=wait_for):
+                proc, path, algo, started, _ = running.pop(conn)
+                try:
+                    record = conn.recv()
+                except EOFError:
+                    proc.join()
+                    record = {"maze": path, "algorithm": algo, "status": "crashed",
+                              "error": f"worker exited with code {proc.exitcode}"}
+                conn.close()
+                proc.join()
+                record.setdefault("time", time.monotonic() - started)
+                finish(record)
+
+            now = time.monotonic()
+            for conn, (proc, path, algo, started, deadline) in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    proc.kill()
+                    proc.join()
+                    conn.close()
+                    del running[conn]
+                    finish({"maze": path, "algorithm": algo, "status": "timeout", "time": now - started})
+    finally:
+        for conn, (proc, *_rest) in running.items():
+            proc.kill()
+            conn.close()
+        writer.close()
+    return records
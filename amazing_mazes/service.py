@@ -0,0 +1,365 @@
+# service.py
+# Long-lived local maze service: python -m amazing_mazes serve
+#
+# A small asyncio HTTP/1.1 server (TCP or Unix socket, keep-alive, JSON in
+# and out) in front of the generators and solvers. The event loop only parses
+# requests and groups them; all maze work runs in worker processes. Each
+# maze is pinned to one worker by a hash of its id, so it is loaded (or
+# regenerated from its seed) once and then stays hot in that worker's LRU,
+# together with its junction graph and distance fields. Only one job per maze
+# is in flight: solve requests that arrive while it runs (or within
+# `batch_window` seconds) go to the worker as the next job, identical
+# (algorithm, path) requests are answered once, and distance queries from
+# all of them share one MazeQueries pass.
+#
+#   GET  /health                                   counters and hot mazes
+#   POST /mazes     {"algo", "size", "seed", "height"} or {"path"}
+#   POST /solve     {"maze", "algo", "path": false}
+#   POST /distance  {"maze", "pairs": [[[r, c], [r, c]], ...], "paths": false}
+import asyncio
+import json
+import os
+import random
+import signal
+import time
+import zlib
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+
+from labyrinth.generate import generator_version, maze_rows
+from labyrinth.registry import GENERATORS, GRAPH_SOLVERS, SOLVERS
+from labyrinth.maze_store import MazeRecord
+
+HOT_MAZES = 8
+MAX_BODY = 16 * 2**20
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# --- worker side: everything below runs in the pool processes ---
+
+class _HotMaze:
+    def __init__(self, core):
+        self.core = core
+        self.start, self.end = core.entrance, core.exit
+        self.graph = None
+        self.queries = None
+
+
+_hot: "OrderedDict[tuple, _HotMaze]" = OrderedDict()
+
+
+def _hot_maze(spec: tuple) -> _HotMaze:
+    hot = _hot.get(spec)
+    if hot is not None:
+        _hot.move_to_end(spec)
+        return hot
+    from labyrinth.maze_core import MazeCore
+    if spec[0] == "file":
+        core = MazeCore.load(spec[1])
+    else:
+        _, algo, size, seed, height = spec
+        core = MazeCore.from_maze([bytes(row).decode("ascii") for row in maze_rows(algo, size, seed, height)])
+    hot = _hot[spec] = _HotMaze(core)
+    while len(_hot) > HOT_MAZES:
+        _hot.popitem(last=False)
+    return hot
+
+
+def _load_job(spec: tuple) -> dict:
+    start = time.perf_counter()
+    hot = _hot_maze(spec)
+    return {"rows": hot.core.rows, "cols": hot.core.cols, "entrance": hot.start, "exit": hot.end,
+            "time": time.perf_counter() - start}
+
+
+def _solve_job(spec: tuple, requests: List[Tuple[str, bool]]) -> List[dict]:
+    from algorithm.junction_graph import JunctionGraph
+    from labyrinth.instrument import PhaseTimer
+    hot = _hot_maze(spec)
+    records = []
+    for algo, want_path in requests:
+        timer = PhaseTimer()
+        record = {"algorithm": algo}
+        if hot.start is None or hot.end is None:
+            record["status"] = "no_endpoints"
+        else:
+            if algo in GRAPH_SOLVERS:
+                if hot.graph is None:
+                    with timer.phase("contract"):
+                        hot.graph = JunctionGraph.build(hot.core, hot.start, hot.end)
+                result = GRAPH_SOLVERS[algo](hot.core, hot.start, hot.end, timer, graph=hot.graph)
+            else:
+                result = SOLVERS[algo](hot.core, hot.start, hot.end, timer)
+            record["status"] = "solved" if result else "no_path"
+            if result:
+                path, explored = result
+                record["path_length"] = len(path)
+                record["nodes_explored"] = timer.counters.get("nodes_explored", len(explored))
+                if want_path:
+                    record["path"] = path
+        record["time"] = timer.phases.get("search", 0.0)
+        record["total_time"] = sum(timer.phases.values())
+        records.append(record)
+    return records
+
+
+def _distance_job(spec: tuple, pairs: List[tuple], want_paths: List[bool]) -> List[dict]:
+    from algorithm.multi_query import MazeQueries
+    hot = _hot_maze(spec)
+    if hot.queries is None:
+        hot.queries = MazeQueries(hot.core)
+    results = hot.queries.solve(pairs)
+    answers = []
+    for i, want in enumerate(want_paths):
+        answer = {"distance": results.distances[i]}
+        if want:
+            answer["path"] = results.path(i)
+        answers.append(answer)
+    return answers
+
+
+# --- server side ---
+
+def _cell(value) -> Tuple[int, int]:
+    r, c = value
+    return int(r), int(c)
+
+
+class MazeService:
+    """Maze registry, request batching and the worker processes behind the HTTP layer.
+
+    Maze ids are MazeRecord names for generated mazes and the path for files;
+    the registry only keeps how to rebuild each one, the grids live in the
+    worker that owns the id.
+    """
+
+    def __init__(self, workers: Optional[int] = None, batch_window: float = 0.002):
+        self.workers = [ProcessPoolExecutor(max_workers=1) for _ in range(workers or os.cpu_count() or 1)]
+        self.batch_window = batch_window
+        self.mazes: Dict[str, tuple] = {}
+        self._solves: Dict[str, Dict[Tuple[str, bool], asyncio.Future]] = {}
+        self._queries: Dict[str, List[Tuple[list, bool, asyncio.Future]]] = {}
+        self._turns: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.counters = {"requests": 0, "solve_requests": 0, "solve_jobs": 0, "solves_run": 0,
+                         "distance_requests": 0, "distance_jobs": 0, "errors": 0}
+        self.started = time.time()
+
+    def close(self) -> None:
+        for pool in self.workers:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, maze_id: str, fn, *args) -> "asyncio.Future":
+        pool = self.workers[zlib.crc32(maze_id.encode("utf-8")) % len(self.workers)]
+        return asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+
+    def _spec(self, maze_id) -> tuple:
+        spec = self.mazes.get(maze_id)
+        if spec is None:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown maze {maze_id!r}, register it with POST /mazes.")
+        return spec
+
+    async def add_maze(self, body: dict) -> dict:
+        if "path" in body:
+            path = str(body["path"])
+            if not os.path.isfile(path):
+                raise RequestError(HTTPStatus.NOT_FOUND, f"{path} does not exist.")
+            maze_id = path
+            spec = ("file", path, os.stat(path).st_mtime_ns)
+            info = {"maze": maze_id}
+        else:
+            algo = body.get("algo", "dfs")
+            if algo not in GENERATORS:
+                raise RequestError(HTTPStatus.BAD_REQUEST, f"Unknown generator {algo!r}.")
+            size = int(body["size"])
+            seed = body.get("seed")
+            seed = random.SystemRandom().randrange(2**31) if seed is None else int(seed)
+            height = int(body.get("height") or size)
+            record = MazeRecord(algo, size, height, seed, generator_version(algo))
+            maze_id = record.name
+            spec = ("generated", algo, size, seed, height)
+            info = {"maze": maze_id, "seed": seed, "version": record.version}
+        self.mazes[maze_id] = spec
+        try:
+            info.update(await self._run(maze_id, _load_job, spec))
+        except Exception:
+            del self.mazes[maze_id]
+            raise
+        return info
+
+    async def solve(self, body: dict) -> dict:
+        maze_id = body.get("maze")
+        spec = self._spec(maze_id)
+        algo = body.get("algo", "astar")
+        if algo not in SOLVERS:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Unknown solver {algo!r}.")
+        self.counters["solve_requests"] += 1
+        batch = self._solves.get(maze_id)
+        if batch is None:
+            batch = self._solves[maze_id] = {}
+            asyncio.get_running_loop().create_task(self._flush_solves(maze_id, spec))
+        key = (algo, bool(body.get("path")))
+        future = batch.get(key)
+        if future is None:
+            future = batch[key] = asyncio.get_running_loop().create_future()
+        return dict(await future, maze=maze_id)
+
+    async def _flush_solves(self, maze_id: str, spec: tuple) -> None:
+        # the batch stays open for the window and while the maze's last job runs
+        await asyncio.sleep(self.batch_window)
+        async with self._turns[maze_id]:
+            batch = self._solves.pop(maze_id)
+            self.counters["solve_jobs"] += 1
+            self.counters["solves_run"] += len(batch)
+            try:
+                records = await self._run(maze_id, _solve_job, spec, list(batch))
+            except Exception as e:
+                for future in batch.values():
+                    future.set_exception(e)
+                return
+        for future, record in zip(batch.values(), records):
+            future.set_result(record)
+
+    async def distance(self, body: dict) -> dict:
+        maze_id = body.get("maze")
+        spec = self._spec(maze_id)
+        try:
+            pairs = [(_cell(a), _cell(b)) for a, b in body["pairs"]]
+        except (KeyError, TypeError, ValueError):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "pairs must be a list of [[row, col], [row, col]].") from None
+        self.counters["distance_requests"] += 1
+        batch = self._queries.get(maze_id)
+        if batch is None:
+            batch = self._queries[maze_id] = []
+            asyncio.get_running_loop().create_task(self._flush_queries(maze_id, spec))
+        future = asyncio.get_running_loop().create_future()
+        batch.append((pairs, bool(body.get("paths")), future))
+        return {"maze": maze_id, "results": await future}
+
+    async def _flush_queries(self, maze_id: str, spec: tuple) -> None:
+        await asyncio.sleep(self.batch_window)
+        async with self._turns[maze_id]:
+            batch = self._queries.pop(maze_id)
+            self.counters["distance_jobs"] += 1
+            pairs = [pair for request_pairs, _, _ in batch for pair in request_pairs]
+            wants = [want for request_pairs, want, _ in batch for _ in request_pairs]
+            try:
+                answers = await self._run(maze_id, _distance_job, spec, pairs, wants)
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                return
+        offset = 0
+        for request_pairs, _, future in batch:
+            future.set_result(answers[offset:offset + len(request_pairs)])
+            offset += len(request_pairs)
+
+    def health(self) -> dict:
+        return {"status": "ok", "uptime": time.time() - self.started, "workers": len(self.workers),
+                "mazes": list(self.mazes), **self.counters}
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, dict]:
+        path = target.split("?", 1)[0]
+        if method == "GET" and path == "/health":
+            return HTTPStatus.OK, self.health()
+        routes = {"/mazes": self.add_maze, "/solve": self.solve, "/distance": self.distance}
+        if path not in routes:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"No route for {method} {path}.")
+        if method != "POST":
+            raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, f"{path} expects POST.")
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Body is not valid JSON.") from None
+        if not isinstance(payload, dict):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object.")
+        try:
+            return HTTPStatus.OK, await routes[path](payload)
+        except (KeyError, TypeError, ValueError) as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Bad request: {e}") from None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection, request after request while it is kept alive."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                method, target, version = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                self.counters["requests"] += 1
+                if length > MAX_BODY:
+                    # the body is left unread, so the connection cannot carry another request
+                    self.counters["errors"] += 1
+                    writer.write(_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Body too large."}, False))
+                    await writer.drain()
+                    break
+                body = await reader.readexactly(length)
+                try:
+                    status, payload = await self.dispatch(method, target, body)
+                except RequestError as e:
+                    status, payload = e.status, {"error": str(e)}
+                    self.counters["errors"] += 1
+                except Exception as e:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+                    self.counters["errors"] += 1
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version != "HTTP/1.0")
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def _response(status: int, payload: dict, keep_alive: bool) -> bytes:
+    body = json.dumps(payload).encode("utf-8")
+    status = HTTPStatus(status)
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, unix: Optional[str] = None,
+                workers: Optional[int] = None, batch_window: float = 0.002) -> None:
+    service = MazeService(workers, batch_window)
+    if unix:
+        server = await asyncio.start_unix_server(service.handle, path=unix)
+        where = unix
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+        where = "http://%s:%d" % server.sockets[0].getsockname()[:2]
+    print(f"Maze service on {where} with {len(service.workers)} workers.", flush=True)
+    loop = asyncio.get_running_loop()
+    stop = loop.create_future()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, lambda: stop.done() or stop.set_result(None))
+        except (NotImplementedError, RuntimeError):  # no signal handlers on Windows loops
+            pass
+    try:
+        async with server:
+            await stop
+        print("Maze service stopped.", flush=True)
+    finally:
+        service.close()
+        if unix and os.path.exists(unix):
+            os.remove(unix)
@@ -1,13 +1,257 @@
 # generate.py
 import random
-import time, tracemalloc
+import time
+from array import array
+from importlib.util import find_spec
+from typing import Iterable, Iterator, Optional
+
+from labyrinth.grid import OPEN, check_size, new_grid, add_entrance_exit, grid_rows, grid_to_text
+from labyrinth.registry import GENERATORS, STREAMING_GENERATORS
+
+# NumPy is optional and only used to shuffle Kruskal walls faster, so it is
+# imported by the first Kruskal maze rather than with this module
+_np = None
+KRUSKAL_BACKEND = "numpy" if find_spec("numpy") is not None else "python"
+
+# Eller's algorithm: "0"/"1" random bits -> 0/1 flags -> '#'/'.' cells
+_BIT_TO_FLAG = bytes.maketrans(b"01", b"\0\1")
+_FLAG_TO_CELL = bytes.maketrans(b"\0\1", b"#.")
+
+# Bitmask of unvisited neighbours (right, down, left, up) -> candidate directions
+_DIR_CHOICES = [tuple(d for d in range(4) if mask >> d & 1) for mask in range(16)]
+
+
+def generate_dfs_grid(size: int, seed: Optional[int] = None) -> bytearray:
+    """Iterative DFS backtracker, returns a flat size*size bytearray of '#'/'.'.
+
+    Instead of a call stack, every cell stores the direction it was entered
+    from, so backtracking just walks those directions in reverse and the extra
+    memory is one byte per cell.
+    """
+    check_size(size)
+    rng = random.Random(seed)
+    rand = rng.random
+    grid = new_grid(size)
+
+    # Cell lattice with a one-cell border pre-marked as visited, so neighbour
+    # lookups never need bounds checks. 0 = unvisited, 1..4 = entered by dir-1.
+    n = (size - 1) // 2
+    w = n + 2
+    state = bytearray(w * w)
+    for i in range(w):
+        state[i] = state[(w - 1) * w + i] = state[i * w] = state[i * w + w - 1] = 5
+
+    lat_steps = (1, w, -1, -w)
+    grid_steps = (2, 2 * size, -2, -2 * size)
+    choices = _DIR_CHOICES
+
+    p = w + 1
+    g = size + 1
+    state[p] = 5
+    grid[g] = OPEN
+    while True:
+        mask = ((not state[p + 1]) | (not state[p + w]) << 1
+                | (not state[p - 1]) << 2 | (not state[p - w]) << 3)
+        if mask:
+            options = choices[mask]
+            d = options[int(rand() * len(options))]
+            step = grid_steps[d]
+            grid[g + (step >> 1)] = OPEN
+            g += step
+            grid[g] = OPEN
+            p += lat_steps[d]
+            state[p] = d + 1
+        else:
+            d = state[p] - 1
+            if d == 4:
+                break
+            p -= lat_steps[d]
+            g -= grid_steps[d]
+    return grid
+
+
+def _numpy():
+    global _np
+    if _np is None and KRUSKAL_BACKEND == "numpy":
+        import numpy
+        _np = numpy
+    return _np
+
+
+def generate_kruskal_grid(size: int, seed: Optional[int] = None) -> bytearray:
+    """Kruskal on integer cell ids with a flat array('i') union-find.
+
+    Wall id w joins cell w >> 1 to its right (w & 1 == 0) or lower (w & 1 == 1)
+    neighbour, so the wall list is just a shuffled permutation of integers.
+    With NumPy installed the permutation comes from numpy.random, otherwise
+    from random.shuffle; the same seed gives different mazes on each backend.
+    """
+    check_size(size)
+    grid = new_grid(size)
+    n = (size - 1) // 2
+    cells = n * n
+
+    np = _numpy()
+    if np is not None:
+        order = np.arange(2 * cells, dtype=np.int32)
+        np.random.default_rng(seed).shuffle(order)
+        order = memoryview(order)
+    else:
+        order = array("i", range(2 * cells))
+        random.Random(seed).shuffle(order)
+
+    # Every cell is open from the start, only walls are carved below
+    for r in range(1, size, 2):
+        grid[r * size + 1:r * size + size - 1:2] = b"." * n
+
+    parent = array("i", range(cells))
+    row_step = 2 * size
+    remaining = cells - 1
+    for w in order:
+        a = w >> 1
+        if w & 1:
+            b = a + n
+            if b >= cells:
+                continue
+        else:
+            b = a + 1
+            if b % n == 0:
+                continue
+
+        # find with path halving
+        ra = a
+        while parent[ra] != ra:
+            parent[ra] = ra = parent[parent[ra]]
+        while parent[b] != b:
+            parent[b] = b = parent[parent[b]]
+        if ra == b:
+            continue
+        parent[ra] = b
+
+        row, col = divmod(a, n)
+        if w & 1:
+            grid[row * row_step + row_step + col * 2 + 1] = OPEN
+        else:
+            grid[row * row_step + size + col * 2 + 2] = OPEN
+        remaining -= 1
+        if not remaining:
+            break
+    return grid
+
+
+def generate_eller_rows(width: int, height: Optional[int] = None, seed: Optional[int] = None) -> Iterator[bytes]:
+    """Eller's algorithm: yield a perfect maze one '#'/'.' row at a time.
+
+    Only the set label of each cell in the current row is kept, so memory is
+    O(width) whatever the height. Rows come with the entrance and exit
+    already open, at the same columns add_entrance_exit() would pick.
+    """
+    height = width if height is None else height
+    check_size(width)
+    check_size(height)
+    rng = random.Random(seed)
+    n, m = (width - 1) // 2, (height - 1) // 2
+
+    cells = bytearray(b"#") * width
+    cells[1:width - 1:2] = b"." * n
+    border = bytearray(b"#") * width
+    border[1] = OPEN
+    yield bytes(border)
+
+    label = array("i", range(n))
+    for i in range(m):
+        last = i == m - 1
+        row = bytearray(cells)
+        parent = array("i", range(n))
+        # join neighbours in different sets at random, or always on the last row
+        joins = "1" * (n - 1) if last else format(rng.getrandbits(n - 1), f"0{n - 1}b") if n > 1 else ""
+        c = joins.find("1")
+        while c != -1:
+            a = label[c]
+            while parent[a] != a:
+                parent[a] = a = parent[parent[a]]
+            b = label[c + 1]
+            while parent[b] != b:
+                parent[b] = b = parent[parent[b]]
+            if a != b:
+                parent[b] = a
+                row[2 * c + 2] = OPEN
+            c = joins.find("1", c + 1)
+        yield bytes(row)
+        if last:
+            break
+
+        # resolve every cell to the root of its set
+        for c in range(n):
+            a = label[c]
+            while parent[a] != a:
+                parent[a] = a = parent[parent[a]]
+            label[c] = a
+        # open passages down at random, then give each set left without one
+        # a passage through one of its cells, so no set is cut off
+        below = bytearray(b"#") * width
+        down = bytearray(format(rng.getrandbits(n), f"0{n}b").encode("ascii").translate(_BIT_TO_FLAG))
+        has_down = bytearray(n)
+        c = down.find(1)
+        while c != -1:
+            has_down[label[c]] = 1
+            c = down.find(1, c + 1)
+        lonely = {}
+        for c in range(n):
+            if not has_down[label[c]]:
+                lonely.setdefault(label[c], []).append(c)
+        for root, cols in lonely.items():
+            down[rng.choice(cols)] = 1
+            has_down[root] = 1
+        below[1:width - 1:2] = down.translate(_FLAG_TO_CELL)
+        # cells with a passage keep their set, the others take fresh ids
+        # from the roots no set is using
+        free = iter([r for r in range(n) if not has_down[r]])
+        c = down.find(0)
+        while c != -1:
+            label[c] = next(free)
+            c = down.find(0, c + 1)
+        yield bytes(below)
+
+    border = bytearray(b"#") * width
+    border[width - 2] = OPEN
+    yield bytes(border)
+
+
+def generate_eller_grid(size: int, seed: Optional[int] = None) -> bytearray:
+    """Eller's maze collected into a flat grid, for callers that want the whole square."""
+    return bytearray().join(generate_eller_rows(size, size, seed))
+
+
+# Bump a generator's number whenever a change makes the same seed give a
+# different maze. Kruskal draws its shuffle from NumPy when it is installed,
+# so its stamp also names the backend.
+_GENERATOR_REVISIONS = {"dfs": 1, "kruskal": 1, "eller": 1}
+
+
+def generator_version(algo: str) -> str:
+    """Stamp such that equal (algo, size, seed, stamp) always give the same maze."""
+    version = f"{algo}/{_GENERATOR_REVISIONS[algo]}"
+    return f"{version}/{KRUSKAL_BACKEND}" if algo == "kruskal" else version
+
+
+def maze_rows(algo: str, size: int, seed: Optional[int] = None, height: Optional[int] = None) -> Iterable[bytes]:
+    """Rows of a finished maze (entrance and exit open) from any generator."""
+    if algo in STREAMING_GENERATORS:
+        return STREAMING_GENERATORS[algo](size, height, seed)
+    if height is not None and height != size:
+        raise ValueError(f"--height needs a streaming generator ({', '.join(STREAMING_GENERATORS)}).")
+    grid = GENERATORS[algo](size, seed)
+    add_entrance_exit(grid, size)
+    return grid_rows(grid, size)
+
 
 def generationlabyrinth():
-    size_input = input("Enter the size of the labyrinth (between 5 - 50) : ")
+    size_input = input("Enter the size of the labyrinth (between 5 - 10001) : ")
     try:
         size = int(size_input)
-        if not (5 <= size <= 50):
-            print("Please enter a valid number between 5 and 50.")
+        if not (5 <= size <= 10001):
+            print("Please enter a valid number between 5 and 10001.")
             return generationlabyrinth()
     except ValueError:
         print("Invalid input. Please enter a number.")
@@ -22,79 +266,27 @@ def generationlabyrinth():
         print(f"Size {old} adjusted to nearest odd size {size} for correct maze generation.")
 
     # Choice of algorithm
-    algo = input("Choose algorithm (dfs / kruskal) : ").strip().lower()
-    if algo not in ["dfs", "kruskal"]:
-        print("Invalid choice. Please choose 'dfs' or 'kruskal'.")
+    algo = input("Choose algorithm (dfs / kruskal / eller) : ").strip().lower()
+    if algo not in ["dfs", "kruskal", "eller"]:
+        print("Invalid choice. Please choose 'dfs', 'kruskal' or 'eller'.")
         return generationlabyrinth()
 
-    # ALGO DFS BACKTRACKING
-    def generate_dfs(size):
-        start = time.perf_counter()
-        tracemalloc.start()
-        tracemalloc.reset_peak()
-        maze = [["#" for _ in range(size)] for _ in range(size)]
-        dirs = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-
-        def is_valid(x, y):
-            return 0 < x < size - 1 and 0 < y < size - 1
-
-        def carve(x, y):
-            maze[y][x] = "."
-            order = dirs[:]
-            random.shuffle(order)
-            for dx, dy in order:
-                nx, ny = x + dx * 2, y + dy * 2
-                if is_valid(nx, ny) and maze[ny][nx] == "#":
-                    maze[y + dy][x + dx] = "."
-                    carve(nx, ny)
-
-        carve(1, 1)
-        end = time.perf_counter()
-        peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-        print(f"Maze generated in {end - start:.4f} seconds.")
-        print(f"Current memory usage is {peak[0] / 10**6:.4f}MB; Peak was {peak[1] / 10**6:.4f}MB")
-        return maze
+    # Seed, so the same maze can be rebuilt later instead of kept on disk
+    seed_input = input("Enter a seed (leave empty for a random one) : ").strip()
+    try:
+        seed = int(seed_input) if seed_input else random.SystemRandom().randrange(2**31)
+    except ValueError:
+        print("Invalid seed. Please enter a whole number.")
+        return generationlabyrinth()
+
+    import tracemalloc
 
-    # ALGO KRUSKAL
-    def generate_kruskal(size):
+    # Time and trace the generator the registry maps `algo` to
+    def timed(gen):
         start = time.perf_counter()
         tracemalloc.start()
         tracemalloc.reset_peak()
-        maze = [["#" for _ in range(size)] for _ in range(size)]
-
-        # Create cells and sets
-        cells = [(x, y) for y in range(1, size, 2) for x in range(1, size, 2)]
-        sets = {cell: cell for cell in cells}
-
-        def find(cell):
-            while sets[cell] != cell:
-                sets[cell] = sets[sets[cell]]
-                cell = sets[cell]
-            return cell
-
-        def union(a, b):
-            sets[find(a)] = find(b)
-
-        walls = []
-        for x, y in cells:
-            if x + 2 < size:
-                walls.append(((x, y), (x + 2, y), (x + 1, y)))
-            if y + 2 < size:
-                walls.append(((x, y), (x, y + 2), (x, y + 1)))
-
-        random.shuffle(walls)
-
-        for cell1, cell2, wall in walls:
-            if find(cell1) != find(cell2):
-                union(cell1, cell2)
-                x1, y1 = cell1
-                x2, y2 = cell2
-                wx, wy = wall
-                maze[y1][x1] = "."
-                maze[y2][x2] = "."
-                maze[wy][wx] = "."
-
+        maze = gen(size, seed)
         end = time.perf_counter()
         peak = tracemalloc.get_traced_memory()
         tracemalloc.stop()
@@ -102,16 +294,11 @@ def generationlabyrinth():
         print(f"Current memory usage is {peak[0] / 10**6:.4f}MB; Peak was {peak[1] / 10**6:.4f}MB")
         return maze
 
-    # Select and generate maze
-    if algo == "dfs":
-        maze = generate_dfs(size)
-    else:
-        maze = generate_kruskal(size)
+    grid = timed(GENERATORS[algo])
 
-    # Add entry and exit
-    entry_col = next((c for c in range(1, size - 1) if maze[1][c] == "."), 1)
-    maze[0][entry_col] = "."
-    exit_col = next((c for c in range(size - 2, 0, -1) if maze[size - 2][c] == "."), size - 2)
-    maze[size - 1][exit_col] = "."
+    print(f"Seed {seed} ({generator_version(algo)}), rebuild it with: "
+          f"python -m amazing_mazes generate --algo {algo} --size {size} --seed {seed}")
 
-    return "\n".join("".join(row) for row in maze)
\ No newline at end of file
+    # Add entry and exit
+    add_entrance_exit(grid, size)
+    return grid_to_text(grid, size)
@@ -1,10 +1,17 @@
+from typing import Optional
 
-def generate_file(content):
+from labyrinth.maze_format import write_maze_binary
+
+
+def generate_file(content, fmt: str = "txt", generator: str = "", seed: Optional[int] = None):
     name_file = str(input("Enter the name of the file: "))
-    path = f"labyrinth/generated_maze/{name_file}.txt"
+    path = f"labyrinth/generated_maze/{name_file}.{fmt}"
 
-    with open(path, 'w') as file:
-        file.write(content)
+    if fmt == "maze":
+        write_maze_binary(path, content.split("\n"), generator, seed)
+    else:
+        with open(path, 'w') as file:
+            file.write(content)
     print(f"File '{path}' has been created inside labyrinth/generated_maze/ folder.")
     
-    return path
\ No newline at end of file
+    return path
@@ -0,0 +1,102 @@
+# grid.py
+# Compact maze storage: one byte per cell in a flat row-major bytearray,
+# using the same '#' / '.' characters as the text files.
+from array import array
+from typing import BinaryIO, Iterable, Iterator, List, Tuple
+
+WALL = ord("#")
+OPEN = ord(".")
+
+
+def check_size(size: int) -> None:
+    if size < 3 or size % 2 == 0:
+        raise ValueError(f"Maze size must be an odd number >= 3, got {size}.")
+
+
+def new_grid(size: int) -> bytearray:
+    return bytearray(b"#") * (size * size)
+
+
+def add_entrance_exit(grid: bytearray, size: int) -> None:
+    # Same rule as the interactive generator: entry above the first open cell
+    # of the second row, exit below the last open cell of the second-to-last row.
+    row1 = size
+    entry_col = next((c for c in range(1, size - 1) if grid[row1 + c] == OPEN), 1)
+    grid[entry_col] = OPEN
+    row_last = (size - 2) * size
+    exit_col = next((c for c in range(size - 2, 0, -1) if grid[row_last + c] == OPEN), size - 2)
+    grid[(size - 1) * size + exit_col] = OPEN
+
+
+def grid_rows(grid: bytearray, size: int) -> Iterator[bytes]:
+    view = memoryview(grid)
+    for start in range(0, len(grid), size):
+        yield view[start:start + size]
+
+
+def grid_to_text(grid: bytearray, size: int) -> str:
+    return b"\n".join(bytes(row) for row in grid_rows(grid, size)).decode("ascii")
+
+
+def write_rows_text(rows: Iterable[bytes], file: BinaryIO) -> None:
+    # Streams rows as they come, so no second copy of the maze is built in memory
+    for i, row in enumerate(rows):
+        if i:
+            file.write(b"\n")
+        file.write(row)
+
+
+def write_grid_text(grid: bytearray, size: int, path: str) -> None:
+    with open(path, "wb") as file:
+        write_rows_text(grid_rows(grid, size), file)
+
+
+def unpad_cells(padded: bytearray, rows: int, cols: int) -> bytearray:
+    width = cols + 2
+    return bytearray().join(padded[(r + 1) * width + 1:(r + 1) * width + 1 + cols] for r in range(rows))
+
+
+def trace_back(state: bytearray, width: int, idx: int, start_marker: int) -> List[Tuple[int, int]]:
+    """Rebuild a path on a padded grid whose cells store their entry direction.
+
+    state[idx] is 1..4 for a cell entered by moving up, down, left or right,
+    and start_marker for the first cell. Returns unpadded (row, col) from the
+    start cell to idx.
+    """
+    cells = trace_back_indices(state, width, idx, start_marker)
+    return [(p // width - 1, p % width - 1) for p in cells]
+
+
+def trace_back_indices(state: bytearray, width: int, idx: int, start_marker: int) -> array:
+    """Padded indices of the path trace_back() returns, from the start cell to idx."""
+    steps = (-width, width, -1, 1)
+    cells = array("i")
+    while state[idx] != start_marker:
+        cells.append(idx)
+        idx -= steps[state[idx] - 1]
+    cells.append(idx)
+    cells.reverse()
+    return cells
+
+
+class CellSet:
+    """Read-only set of (row, col) backed by a flat bytearray of 0/1 flags."""
+
+    def __init__(self, flags: bytearray, width: int):
+        self.flags = flags
+        self.width = width
+
+    def __contains__(self, pos) -> bool:
+        r, c = pos
+        i = r * self.width + c
+        return 0 <= c < self.width and 0 <= i < len(self.flags) and self.flags[i] == 1
+
+    def __iter__(self):
+        flags, width = self.flags, self.width
+        i = flags.find(1)
+        while i != -1:
+            yield divmod(i, width)
+            i = flags.find(1, i + 1)
+
+    def __len__(self) -> int:
+        return self.flags.count(1)
@@ -0,0 +1,163 @@
+# instrument.py
+# Lightweight measurement for solves: per-phase wall-clock timers, an optional
+# peak-RSS sampler (cheap, unlike tracemalloc which slows allocation-heavy
+# code several times over) and a stats object returned to the caller.
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Report order of the timed phases. "load" includes building the MazeCore,
+# which also locates the entrance and exit; "write" streams the rendered
+# solution to its file.
+PHASES = ("load", "load_graph", "contract", "search", "reconstruct", "write")
+MEMORY_MODES = ("none", "rss", "tracemalloc")
+
+
+class PhaseTimer:
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    def count(self, name: str, value: int) -> None:
+        self.counters[name] = value
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+
+class NullTimer(PhaseTimer):
+    """Timer that records nothing, the default for solvers called directly."""
+
+    @contextmanager
+    def phase(self, name: str):
+        yield
+
+    def count(self, name: str, value: int) -> None:
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+
+def current_rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 10**6
+    except (OSError, ValueError, AttributeError):
+        if resource is None:
+            return None
+        # no /proc: fall back to the lifetime peak (KB on Linux, bytes on macOS)
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / 10**6 if sys.platform == "darwin" else maxrss / 10**3
+
+
+class RSSSampler:
+    """Samples the process RSS from a background thread while active."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.start_mb: Optional[float] = None
+        self.peak_mb: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self) -> None:
+        rss = current_rss_mb()
+        if rss is not None and (self.peak_mb is None or rss > self.peak_mb):
+            self.peak_mb = rss
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.start_mb = current_rss_mb()
+        self.peak_mb = self.start_mb
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+@contextmanager
+def memory_monitor(mode: str, stats: "SolveStats"):
+    """Fill stats.peak_rss_mb or stats.traced_peak_mb around the block."""
+    if mode == "rss":
+        with RSSSampler() as sampler:
+            yield
+        stats.peak_rss_mb = sampler.peak_mb
+        if sampler.peak_mb is not None and sampler.start_mb is not None:
+            stats.rss_growth_mb = sampler.peak_mb - sampler.start_mb
+    elif mode == "tracemalloc":
+        import tracemalloc  # not loaded unless a solve asks for it
+        tracemalloc.start()
+        try:
+            yield
+            stats.traced_peak_mb = tracemalloc.get_traced_memory()[1] / 10**6
+        finally:
+            tracemalloc.stop()
+    else:
+        yield
+
+
+@dataclass
+class SolveStats:
+    maze: str
+    algorithm: str
+    status: str = "pending"
+    path_length: Optional[int] = None
+    nodes_explored: Optional[int] = None
+    phases: Dict[str, float] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+    peak_rss_mb: Optional[float] = None
+    rss_growth_mb: Optional[float] = None
+    traced_peak_mb: Optional[float] = None
+    solution: Optional[str] = None
+
+    @property
+    def solved(self) -> bool:
+        return self.status == "solved"
+
+    @property
+    def search_time(self) -> float:
+        return self.phases.get("search", 0.0)
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.phases.values())
+
+    def as_dict(self) -> dict:
+        record = asdict(self)
+        record["time"] = record["search_time"] = self.search_time
+        record["total_time"] = self.total_time
+        return record
+
+    def report(self) -> str:
+        lines = [f"{self.algorithm} on {self.maze}: " + (f"path length {self.path_length}, "
+                 f"{self.nodes_explored} nodes explored" if self.solved else self.status)
+                 + (" (cached result)" if self.counters.get("cache_hit") else "")]
+        lines.append("  " + ", ".join(f"{name} {self.phases[name]:.4f}s" for name in PHASES if name in self.phases))
+        if self.peak_rss_mb is not None:
+            lines.append(f"  peak RSS {self.peak_rss_mb:.2f}MB (+{self.rss_growth_mb or 0:.2f}MB during the solve)")
+        if self.traced_peak_mb is not None:
+            lines.append(f"  traced peak {self.traced_peak_mb:.4f}MB")
+        return "\n".join(lines)
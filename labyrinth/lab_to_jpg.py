@@ -1,35 +1,83 @@
-from PIL import Image
 import os
 
-def txt_to_image(txt_file, output_file, cell_size=20):
-    with open(txt_file, "r") as f:
-        lines = [line.strip() for line in f]
-    h, w = len(lines), len(lines[0])
-    img = Image.new("RGB", (w * cell_size, h * cell_size), "white")
-    pixels = img.load()
-    
-    for y, row in enumerate(lines):
-        for x, char in enumerate(row):
-            if char == "#":
-                color = (0, 0, 0)   
-            elif char == "*":
-                color = (0, 0, 255)   
-            elif char == "O":
-                color = (255, 0, 0)    
-            elif char == "S":
-                color = (0, 255, 0)   
-            elif char == "E":
-                color = (255, 255, 0)   
-            else:
-                color = (255, 255, 255)  
-            for dy in range(cell_size):
-                for dx in range(cell_size):
-                    pixels[x * cell_size + dx, y * cell_size + dy] = color
+from labyrinth.maze_format import iter_maze_rows
+
+# Pillow is imported by the functions that draw, so the solvers and the CLI
+# can import this module without paying for it
+
+# Palette index per maze character; anything unknown renders as an open cell
+PALETTE_COLORS = [
+    (255, 255, 255),  # open '.'
+    (0, 0, 0),        # wall '#'
+    (0, 0, 255),      # path '*'
+    (255, 0, 0),      # explored 'O'
+    (0, 255, 0),      # start 'S'
+    (255, 255, 0),    # end 'E'
+    (128, 128, 128),  # outside the maze, transparent in tiles
+]
+BACKGROUND = 6
+PALETTE = [channel for color in PALETTE_COLORS for channel in color]
+CHAR_TO_INDEX = bytes({ord("#"): 1, ord("*"): 2, ord("O"): 3, ord("S"): 4, ord("E"): 5}.get(i, 0) for i in range(256))
+PALETTE_FORMATS = (".png", ".gif", ".bmp")
+
+
+def maze_to_palette_image(lines, cell_size=20):
+    # One byte per cell, then a single nearest-neighbour upscale in C
+    from PIL import Image
+    h, w = len(lines), max(len(line) for line in lines)
+    data = b"".join(line.ljust(w, b".").translate(CHAR_TO_INDEX) for line in lines)
+    img = Image.frombytes("P", (w, h), data)
+    img.putpalette(PALETTE)
+    if cell_size != 1:
+        img = img.resize((w * cell_size, h * cell_size), Image.NEAREST)
+    return img
+
+
+# Heatmap palette: index 0 for walls and unreachable cells, then 255 steps
+# from blue (near the source) through green to red (farthest)
+HEATMAP_PALETTE = [0, 0, 0] + [
+    channel
+    for i in range(255)
+    for channel in ((0, 4 * i, 255 - 2 * i) if i < 64 else
+                    (0, 255, max(0, 127 - 2 * (i - 64))) if i < 128 else
+                    (min(255, 2 * (i - 128)), max(0, 255 - 2 * (i - 128)), 0))
+]
 
+
+def distance_heatmap(distances, cols, cell_size=4):
+    """Palette image of a row-major distance map (-1 = wall or unreachable)."""
+    from PIL import Image
+    rows = len(distances) // cols
+    far = max(max(distances), 1)
+    shade = [0] + [1 + d * 254 // far for d in range(far + 1)]
+    data = bytearray()
+    for r in range(rows):
+        data += bytes(shade[d + 1] for d in distances[r * cols:(r + 1) * cols])
+    img = Image.frombytes("P", (cols, rows), data)
+    img.putpalette(HEATMAP_PALETTE)
+    if cell_size != 1:
+        img = img.resize((cols * cell_size, rows * cell_size), Image.NEAREST)
+    return img
+
+
+def save_heatmap(distances, cols, output_file, cell_size=4):
+    img = distance_heatmap(distances, cols, cell_size)
+    if not output_file.lower().endswith(PALETTE_FORMATS):
+        img = img.convert("RGB")
+    img.save(output_file)
+    print(f"Heatmap saved as {output_file}")
+
+
+def txt_to_image(txt_file, output_file, cell_size=20):
+    lines = list(iter_maze_rows(txt_file))
+    img = maze_to_palette_image(lines, cell_size)
+    # Palette formats keep the exact colours, JPG needs RGB
+    if not output_file.lower().endswith(PALETTE_FORMATS):
+        img = img.convert("RGB")
     img.save(output_file)
     print(f"Image saved as {output_file}")
 
-def convert_solution_to_image(filename: str, algorithm: str):
+def convert_solution_to_image(filename: str, algorithm: str, fmt: str = "jpg"):
     algorithm = algorithm.lower()
     if algorithm == "astar":
         folder = "solutions_astar"
@@ -42,15 +90,15 @@ def convert_solution_to_image(filename: str, algorithm: str):
         return
     
     txt_path = f"labyrinth/{folder}/{filename}{suffix}.txt"
-    jpg_path = f"labyrinth/{folder}/{filename}{suffix}.jpg"
+    image_path = f"labyrinth/{folder}/{filename}{suffix}.{fmt}"
     
     if not os.path.exists(txt_path):
         print(f"File not found: {txt_path}")
         return
 
-    answer = input(f"Do you want to convert the {algorithm} solution to JPG? (y/n): ").strip().lower()
+    answer = input(f"Do you want to convert the {algorithm} solution to {fmt.upper()}? (y/n): ").strip().lower()
     if answer == "y":
-        txt_to_image(txt_path, jpg_path)
+        txt_to_image(txt_path, image_path)
     else:
         print("Conversion skipped.")
 
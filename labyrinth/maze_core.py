@@ -0,0 +1,167 @@
+# maze_core.py
+# One loaded form of a maze shared by the solvers: a flat bytearray on the
+# padded grid (width cols + 2, a wall border all round) where every open cell holds
+# OPEN_BIT plus one bit per open neighbour, in the solvers' direction order
+# up, down, left, right. The masks are computed a band of rows at a time with
+# big-int shifts, so a solver never bounds-checks or compares characters,
+# and the entrance and exit are found once when the maze is loaded. A core
+# also reads like a list of '#'/'.' rows, so it is built once per maze and
+# passed to the solvers, the overlay writer and the indexes alike.
+import os
+from typing import List, Optional, Tuple
+
+from labyrinth.grid import OPEN, CellSet, unpad_cells
+from labyrinth.maze_format import MazeFile, open_maze
+
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+OPEN_BIT = 16
+OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+# mask -> directions (0..3) of its open neighbours, and their (dr, dc)
+OPEN_DIRS = tuple(tuple(d for d in range(4) if mask >> d & 1) for mask in range(32))
+OPEN_OFFSETS = tuple(tuple(OFFSETS[d] for d in dirs) for dirs in OPEN_DIRS)
+
+MAZE_DIR = "labyrinth/generated_maze"
+
+# rows per big-int pass in from_maze()
+BAND_ROWS = 256
+
+_OPEN_FLAGS = bytes(1 if i == OPEN else 0 for i in range(256))
+_MASK_TO_CHAR = b"#" + b"." * 255
+_BLOCKED_TABLES = {}
+
+
+def find_start_and_end(maze: List[List[str]]) -> Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]:
+    """Entrance = first open cell of the top row, exit = first open cell of the bottom row."""
+    if isinstance(maze, (MazeFile, MazeCore)):
+        return maze.entrance, maze.exit
+    start = end = None
+    if not maze:
+        return start, end
+    top = "".join(maze[0]).find(".")
+    bottom = "".join(maze[-1]).find(".")
+    if top != -1:
+        start = (0, top)
+    if bottom != -1:
+        end = (len(maze) - 1, bottom)
+    return start, end
+
+
+def maze_file_path(filename: str) -> str:
+    """labyrinth/generated_maze/<filename>.maze, unless a .txt of that name is newer."""
+    binary_path = f"{MAZE_DIR}/{filename}.maze"
+    text_path = f"{MAZE_DIR}/{filename}.txt"
+    try:
+        binary_mtime = os.path.getmtime(binary_path)
+    except OSError:
+        return text_path
+    try:
+        # the .txt was edited or regenerated after the .maze was written
+        if os.path.getmtime(text_path) > binary_mtime:
+            return text_path
+    except OSError:
+        pass
+    return binary_path
+
+
+def load_maze_from_file(filename: str) -> Optional["MazeCore"]:
+    """The core of the maze maze_file_path() picks for `filename`."""
+    path = maze_file_path(filename)
+    try:
+        return MazeCore.load(path)
+    except FileNotFoundError:
+        print(f"Error: File '{path}' does not exist.")
+        return None
+
+
+class MazeCore:
+    def __init__(self, rows: int, cols: int, masks: bytearray,
+                 entrance: Optional[Tuple[int, int]], exit: Optional[Tuple[int, int]]):
+        self.rows, self.cols = rows, cols
+        self.width = cols + 2
+        self.masks = masks
+        self.entrance = entrance
+        self.exit = exit
+
+    @classmethod
+    def from_maze(cls, maze) -> "MazeCore":
+        rows, cols = len(maze), len(maze[0])
+        w = cols + 2
+        masks = bytearray(w * (rows + 2))
+        border = bytes(w)
+
+        def flags(r):
+            # maze row r with its border cells, 1 for open and 0 for walls
+            if not 0 <= r < rows:
+                return border
+            return b"\0" + "".join(maze[r]).encode("ascii").translate(_OPEN_FLAGS) + b"\0"
+
+        # Whole bands of rows at a time, each with the row above and below it,
+        # so the big ints stay a few MB even when the maze is huge. Byte i of
+        # the big-endian int sits 8 * (size - 1 - i) bits up, so the cell
+        # above arrives with >> 8w, the one below with << 8w, left and right
+        # with >> 8 and << 8; the extra shift moves each onto its bit.
+        # Masking with o * 15 keeps open cells only and drops the overflow.
+        for top in range(0, rows, BAND_ROWS):
+            bottom = min(top + BAND_ROWS, rows)
+            band = b"".join(flags(r) for r in range(top - 1, bottom + 1))
+            o = int.from_bytes(band, "big")
+            band_masks = (o >> 8 * w | o << 8 * w + 1 | o >> 6 | o << 11) & o * 15 | o * OPEN_BIT
+            band = band_masks.to_bytes(len(band), "big")
+            masks[(top + 1) * w:(bottom + 1) * w] = band[w:-w]
+        start, end = find_start_and_end(maze)
+        return cls(rows, cols, masks, start, end)
+
+    @classmethod
+    def of(cls, maze) -> "MazeCore":
+        """`maze` itself when it already is a core, else one built from its rows."""
+        return maze if isinstance(maze, cls) else cls.from_maze(maze)
+
+    @classmethod
+    def load(cls, path: str) -> "MazeCore":
+        with open_maze(path) as maze:
+            return cls.from_maze(maze)
+
+    def index(self, cell: Tuple[int, int]) -> int:
+        return (cell[0] + 1) * self.width + cell[1] + 1
+
+    def cell(self, idx: int) -> Tuple[int, int]:
+        r, c = divmod(idx, self.width)
+        return r - 1, c - 1
+
+    def cells(self, indices) -> List[Tuple[int, int]]:
+        w = self.width
+        return [(p // w - 1, p % w - 1) for p in indices]
+
+    def cell_set(self, flags: bytearray) -> CellSet:
+        """CellSet of the cells whose padded flag byte is 1."""
+        return CellSet(unpad_cells(flags, self.rows, self.cols), self.cols)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, r: int) -> str:
+        if r < 0:
+            r += self.rows
+        if not 0 <= r < self.rows:
+            raise IndexError("maze row out of range")
+        start = (r + 1) * self.width + 1
+        return self.masks[start:start + self.cols].translate(_MASK_TO_CHAR).decode("ascii")
+
+    def __iter__(self):
+        for r in range(self.rows):
+            yield self[r]
+
+    def is_open(self, r: int, c: int) -> bool:
+        return bool(self.masks[(r + 1) * self.width + c + 1])
+
+    def state(self, blocked: int) -> bytearray:
+        """Fresh padded state array: 0 for open cells, `blocked` for walls and the border."""
+        table = _BLOCKED_TABLES.get(blocked)
+        if table is None:
+            table = _BLOCKED_TABLES[blocked] = bytes([blocked]) + bytes(255)
+        return self.masks.translate(table)
+
+    def neighbors(self, position: Tuple[int, int]) -> List[Tuple[int, int]]:
+        r, c = position
+        return [(r + dr, c + dc) for dr, dc in OPEN_OFFSETS[self.masks[(r + 1) * self.width + c + 1]]]
+
@@ -0,0 +1,166 @@
+# maze_format.py
+# Binary .maze files: a fixed header followed by one bit per cell
+# (1 = open, 0 = wall), rows padded to whole bytes, most significant bit first.
+import mmap
+import struct
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+MAGIC = b"AMAZE\0"
+VERSION = 1
+NO_SEED = -1
+# stored for both coordinates of a missing entrance or exit
+NO_CELL = 0xFFFFFFFF
+# magic, version, rows, cols, entrance row/col, exit row/col, generator, seed
+HEADER = struct.Struct("<6sHIIIIII16sq")
+
+_TO_BITS = bytes.maketrans(b"#.", b"01")
+_FROM_BITS = str.maketrans("01", "#.")
+
+
+def row_bytes(cols: int) -> int:
+    return (cols + 7) // 8
+
+
+def pack_row(row: Union[bytes, str]) -> bytes:
+    if isinstance(row, str):
+        row = row.encode("ascii")
+    nbytes = row_bytes(len(row))
+    # base-2 int parsing is linear, so this stays in C for the whole row
+    bits = int(bytes(row).translate(_TO_BITS), 2) << (nbytes * 8 - len(row))
+    return bits.to_bytes(nbytes, "big")
+
+
+def unpack_row(data: bytes, cols: int) -> str:
+    bits = format(int.from_bytes(data, "big"), f"0{len(data) * 8}b")
+    return bits[:cols].translate(_FROM_BITS)
+
+
+def write_maze_binary(path: str, rows: Iterable[Union[bytes, str]], generator: str = "",
+                      seed: Optional[int] = None) -> Tuple[int, int]:
+    """Stream '#'/'.' rows into a .maze file and return its (rows, cols).
+
+    The entrance is the first open cell of the first row and the exit the first
+    open cell of the last row, like find_start_and_end(); a row without an
+    opening stores NO_CELL instead. Blank rows (a trailing newline) are
+    skipped. The header is written last, so rows can come from a generator
+    that never holds the whole maze.
+    """
+    n_rows = cols = 0
+    entrance = (NO_CELL, NO_CELL)
+    with open(path, "wb") as file:
+        file.write(bytes(HEADER.size))
+        last = b""
+        for row in rows:
+            if isinstance(row, str):
+                row = row.encode("ascii")
+            row = bytes(row).strip()
+            if not row:
+                continue
+            if n_rows == 0:
+                cols = len(row)
+                entrance = _endpoint(0, row)
+            file.write(pack_row(row))
+            last = row
+            n_rows += 1
+        exit_ = _endpoint(n_rows - 1, last)
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, n_rows, cols, *entrance, *exit_,
+                               generator.encode("ascii")[:16],
+                               NO_SEED if seed is None else seed))
+    return n_rows, cols
+
+
+def _endpoint(r: int, row: bytes) -> Tuple[int, int]:
+    c = row.find(b".")
+    return (NO_CELL, NO_CELL) if c == -1 else (r, c)
+
+
+def _cell(r: int, c: int) -> Optional[Tuple[int, int]]:
+    return None if r == NO_CELL else (r, c)
+
+
+class MazeFile:
+    """Memory-mapped .maze file that reads like a list of '#'/'.' rows.
+
+    Rows are decoded on access, so `maze[r][c]`, `len(maze)` and iteration
+    work with the existing solver helpers while the file itself stays on disk.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.rows, self.cols, er, ec, xr, xc,
+         generator, seed) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} .maze file.")
+        self.entrance = _cell(er, ec)
+        self.exit = _cell(xr, xc)
+        self.generator = generator.rstrip(b"\0").decode("ascii")
+        self.seed = None if seed == NO_SEED else seed
+        self.row_bytes = row_bytes(self.cols)
+
+    def row_data(self, r: int) -> bytes:
+        start = HEADER.size + r * self.row_bytes
+        return self._mm[start:start + self.row_bytes]
+
+    def is_open(self, r: int, c: int) -> bool:
+        byte = self._mm[HEADER.size + r * self.row_bytes + (c >> 3)]
+        return bool(byte >> (7 - (c & 7)) & 1)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, r: int) -> str:
+        if r < 0:
+            r += self.rows
+        if not 0 <= r < self.rows:
+            raise IndexError("maze row out of range")
+        return unpack_row(self.row_data(r), self.cols)
+
+    def __iter__(self):
+        for r in range(self.rows):
+            yield self[r]
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_maze_rows(path: str) -> Iterator[bytes]:
+    """Yield the '#'/'.' rows of a text or .maze file one at a time."""
+    if path.endswith(".maze"):
+        with MazeFile(path) as maze:
+            for row in maze:
+                yield row.encode("ascii")
+    else:
+        with open(path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+
+
+def load_maze(path: str) -> Union[List[List[str]], MazeFile]:
+    if path.endswith(".maze"):
+        return MazeFile(path)
+    with open(path, "r") as file:
+        return [list(row) for row in file.read().strip().split("\n")]
+
+
+@contextmanager
+def open_maze(path: str) -> Iterator[Union[List[List[str]], MazeFile]]:
+    """load_maze() for a with block: a .maze file's mapping is closed on exit."""
+    maze = load_maze(path)
+    try:
+        yield maze
+    finally:
+        if isinstance(maze, MazeFile):
+            maze.close()
@@ -0,0 +1,138 @@
+# maze_store.py
+# Seed-addressable corpus: every maze is fully determined by its generator,
+# size, seed and generator version, so the store keeps only those records and
+# rebuilds a maze when it is asked for. Consecutive seeds are kept as one run
+# (algo, size, height, version, first seed, count), which is how
+# `generate --count` numbers them, so a million-maze corpus is a few lines of
+# JSON. Recently rebuilt mazes stay in a small LRU of finished rows.
+import json
+import os
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from labyrinth.generate import GENERATORS, STREAMING_GENERATORS, generator_version, maze_rows
+from labyrinth.grid import check_size, write_rows_text
+from labyrinth.maze_format import write_maze_binary
+
+FORMAT = 1
+
+
+class MazeRecord(NamedTuple):
+    algo: str
+    size: int
+    height: int
+    seed: int
+    version: str
+
+    @property
+    def name(self) -> str:
+        shape = self.size if self.height == self.size else f"{self.size}x{self.height}"
+        return f"{self.algo}_{shape}_{self.seed}"
+
+
+class MazeStore:
+    """Records of generated mazes in a JSON file, rebuilt on demand.
+
+    Mazes are addressed by their position in the store, 0 .. len(store)-1.
+    `max_mazes` rebuilt mazes are kept in memory; the store refuses to rebuild
+    a record whose version stamp this install no longer produces, instead of
+    returning a different maze under the same seed.
+    """
+
+    def __init__(self, path: str, max_mazes: int = 8):
+        self.path = path
+        self.max_mazes = max_mazes
+        self.runs: List[dict] = []
+        self._mazes: "OrderedDict[MazeRecord, List[bytes]]" = OrderedDict()
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("format") != FORMAT:
+                raise ValueError(f"{path} is not a format {FORMAT} maze store.")
+            self.runs = data["runs"]
+        self._index()
+
+    def _index(self) -> None:
+        self._starts = []
+        total = 0
+        for run in self.runs:
+            self._starts.append(total)
+            total += run["count"]
+        self._total = total
+
+    def __len__(self) -> int:
+        return self._total
+
+    def add(self, algo: str, size: int, seed: int, count: int = 1, height: Optional[int] = None) -> range:
+        """Record mazes seed .. seed+count-1 and return their ids (nothing is generated)."""
+        if algo not in GENERATORS:
+            raise ValueError(f"Unknown generator {algo!r}.")
+        if count < 1:
+            raise ValueError("count must be at least 1.")
+        # reject shapes the generator could not rebuild later
+        height = size if height is None else height
+        check_size(size)
+        check_size(height)
+        if height != size and algo not in STREAMING_GENERATORS:
+            raise ValueError(f"--height needs a streaming generator ({', '.join(STREAMING_GENERATORS)}).")
+        run = {"algo": algo, "size": size, "height": height, "version": generator_version(algo),
+               "seed": seed, "count": count}
+        first = self._total
+        last = self.runs[-1] if self.runs else None
+        if (last is not None and last["seed"] + last["count"] == seed
+                and all(last[k] == run[k] for k in ("algo", "size", "height", "version"))):
+            last["count"] += count
+        else:
+            self.runs.append(run)
+        self._index()
+        return range(first, first + count)
+
+    def record(self, i: int) -> MazeRecord:
+        if i < 0:
+            i += self._total
+        if not 0 <= i < self._total:
+            raise IndexError(f"maze {i} is not in the store ({self._total} mazes).")
+        k = bisect_right(self._starts, i) - 1
+        run = self.runs[k]
+        return MazeRecord(run["algo"], run["size"], run["height"], run["seed"] + i - self._starts[k],
+                          run["version"])
+
+    __getitem__ = record
+
+    def __iter__(self) -> Iterator[MazeRecord]:
+        for run in self.runs:
+            for seed in range(run["seed"], run["seed"] + run["count"]):
+                yield MazeRecord(run["algo"], run["size"], run["height"], seed, run["version"])
+
+    def rows(self, i: int) -> List[bytes]:
+        """The finished '#'/'.' rows of maze i, rebuilt from its seed unless recently used."""
+        record = self.record(i)
+        rows = self._mazes.get(record)
+        if rows is not None:
+            self._mazes.move_to_end(record)
+            return rows
+        current = generator_version(record.algo)
+        if record.version != current:
+            raise ValueError(f"Maze {i} was generated by {record.version}, this install builds {current}.")
+        rows = [bytes(row) for row in maze_rows(record.algo, record.size, record.seed, record.height)]
+        self._mazes[record] = rows
+        while len(self._mazes) > self.max_mazes:
+            self._mazes.popitem(last=False)
+        return rows
+
+    def export(self, i: int, path: str) -> Tuple[int, int]:
+        """Write maze i as a .maze file (generator and seed in the header) or as text."""
+        record = self.record(i)
+        rows = self.rows(i)
+        if path.endswith(".maze"):
+            return write_maze_binary(path, rows, record.algo, record.seed)
+        with open(path, "wb") as file:
+            write_rows_text(rows, file)
+        return len(rows), len(rows[0])
+
+    def save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"format": FORMAT, "runs": self.runs}, f, indent=1)
+        os.replace(tmp, self.path)
@@ -0,0 +1,94 @@
+# overlay.py
+# Solution rendering shared by every solver. Marks are grouped by row up
+# front: path cells in a dict, explored cells either as one row slice of a
+# CellSet's flag bytes or grouped the same way as the path. Each annotated
+# row is then built and written on its own, so neither the grid nor the
+# rendered text is ever held in full.
+import sys
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from labyrinth.grid import CellSet
+
+EXPLORED_MARK = ord("O")
+PATH_MARK = ord("*")
+START_MARK = ord("S")
+END_MARK = ord("E")
+_FLAG_TO_DELTA = bytes.maketrans(b"\1", bytes([EXPLORED_MARK - ord(".")]))
+
+# Terminal output is cut to this many rows and columns
+MAX_PRINT_ROWS = 60
+MAX_PRINT_COLS = 160
+
+
+def _row_bytes(row) -> bytearray:
+    if isinstance(row, str):
+        return bytearray(row.encode("ascii"))
+    if isinstance(row, (bytes, bytearray)):
+        return bytearray(row)
+    return bytearray("".join(row).encode("ascii"))
+
+
+def _by_row(cells: Iterable[Tuple[int, int]]) -> Dict[int, List[int]]:
+    rows: Dict[int, List[int]] = {}
+    for r, c in cells:
+        rows.setdefault(r, []).append(c)
+    return rows
+
+
+def iter_overlay_rows(maze, path: List[Tuple[int, int]], explored) -> Iterator[bytearray]:
+    """Yield each maze row with explored cells as 'O' and the path as 'S', '*', 'E'.
+
+    `explored` may be a CellSet (its flag bytes are read a row at a time) or
+    any iterable of (row, col).
+    """
+    path_rows: Dict[int, List[Tuple[int, int]]] = {}
+    for r, c in path:
+        path_rows.setdefault(r, []).append((c, PATH_MARK))
+    if path:
+        (sr, sc), (er, ec) = path[0], path[-1]
+        path_rows[er].append((ec, END_MARK))
+        path_rows[sr].append((sc, START_MARK))
+    flags = explored.flags if isinstance(explored, CellSet) else None
+    explored_rows = None if flags is not None else _by_row(explored)
+
+    for r, row in enumerate(maze):
+        line = _row_bytes(row)
+        cols = len(line)
+        if flags is not None:
+            # explored cells are always open ('.'), so adding 'O' - '.' to
+            # exactly those bytes marks the whole row in one big-int addition
+            marks = flags[r * cols:(r + 1) * cols].translate(_FLAG_TO_DELTA)
+            line = bytearray((int.from_bytes(line, "big") + int.from_bytes(marks, "big")).to_bytes(cols, "big"))
+        else:
+            for c in explored_rows.get(r, ()):
+                line[c] = EXPLORED_MARK
+        for c, mark in path_rows.get(r, ()):
+            line[c] = mark
+        yield line
+
+
+def write_overlay(maze, path: List[Tuple[int, int]], explored, out_path: str) -> None:
+    """Stream the annotated maze to `out_path`, one row at a time."""
+    with open(out_path, "wb") as f:
+        for r, line in enumerate(iter_overlay_rows(maze, path, explored)):
+            if r:
+                f.write(b"\n")
+            f.write(line)
+
+
+def overlay_text(maze, path: List[Tuple[int, int]], explored) -> str:
+    return "\n".join(line.decode("ascii") for line in iter_overlay_rows(maze, path, explored))
+
+
+def print_overlay(maze, path: List[Tuple[int, int]], explored, max_rows: int = MAX_PRINT_ROWS,
+                  max_cols: int = MAX_PRINT_COLS, file=None) -> None:
+    """Print the annotated maze, cut to max_rows x max_cols for large mazes."""
+    file = file or sys.stdout
+    rows, cols = len(maze), len(maze[0])
+    for r, line in enumerate(iter_overlay_rows(maze, path, explored)):
+        if r == max_rows:
+            break
+        print(line[:max_cols].decode("ascii"), file=file)
+    if rows > max_rows or cols > max_cols:
+        print(f"... showing {min(rows, max_rows)}x{min(cols, max_cols)} of {rows}x{cols}, "
+              "see the solution file for the full maze", file=file)
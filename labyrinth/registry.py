@@ -0,0 +1,76 @@
+# registry.py
+# Names of the generators, solvers and renderers mapped to "module:attribute"
+# strings. The names are known up front (for menus and argparse choices), but
+# a module is only imported the first time one of its entries is looked up,
+# so generating ASCII never loads the solvers, Pillow or the instrumentation.
+from functools import partial
+from importlib import import_module
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+
+class Registry(Mapping):
+    """Read-only mapping of name -> object, imported from "module:attr" on first use."""
+
+    def __init__(self, kind: str, targets: Dict[str, str], bound: Optional[Dict[str, dict]] = None):
+        self.kind = kind
+        self._targets = dict(targets)
+        self._bound = bound or {}
+        self._loaded: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        obj = self._loaded.get(name)
+        if obj is None:
+            if name not in self._targets:
+                raise KeyError(f"Unknown {self.kind} {name!r}.")
+            module, _, attr = self._targets[name].partition(":")
+            obj = getattr(import_module(module), attr)
+            if name in self._bound:
+                obj = partial(obj, **self._bound[name])
+            self._loaded[name] = obj
+        return obj
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._targets)
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def __contains__(self, name) -> bool:
+        return name in self._targets
+
+    def subset(self, kind: str, names) -> "Registry":
+        return Registry(kind, {n: self._targets[n] for n in names},
+                        {n: self._bound[n] for n in names if n in self._bound})
+
+
+GENERATORS = Registry("generator", {
+    "dfs": "labyrinth.generate:generate_dfs_grid",
+    "kruskal": "labyrinth.generate:generate_kruskal_grid",
+    "eller": "labyrinth.generate:generate_eller_grid",
+})
+
+# Generators that yield finished rows one at a time (entrance and exit
+# included) and so can also build mazes taller than they are wide
+STREAMING_GENERATORS = Registry("streaming generator", {
+    "eller": "labyrinth.generate:generate_eller_rows",
+})
+
+SOLVERS = Registry("solver", {
+    "astar": "algorithm.a_star:a_star_solver_flat",
+    "backtracking": "algorithm.recu_backtraking:iterative_backtracking_solver",
+    "wavefront": "algorithm.wavefront:wavefront_solver",
+    "bidirectional": "algorithm.bidirectional:bidirectional_solver",
+    "dead-end": "algorithm.dead_end:dead_end_filling_solver",
+    "astar-graph": "algorithm.junction_graph:a_star_graph_solver",
+    "backtracking-graph": "algorithm.junction_graph:backtracking_graph_solver",
+}, bound={"backtracking": {"verbose": False}})
+
+# Solvers on the contracted junction graph; solve_path() caches the graph
+# next to the maze file, called directly they contract the maze each time.
+GRAPH_SOLVERS = SOLVERS.subset("graph solver", ("astar-graph", "backtracking-graph"))
+
+RENDERERS = Registry("renderer", {
+    "image": "labyrinth.lab_to_jpg:txt_to_image",
+    "solution-image": "labyrinth.lab_to_jpg:convert_solution_to_image",
+    "heatmap": "labyrinth.lab_to_jpg:save_heatmap",
+})
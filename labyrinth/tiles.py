@@ -0,0 +1,114 @@
+# tiles.py
+# Tiled rendering for mazes too large for one image: streams the maze rows
+# and writes an XYZ pyramid ({out_dir}/{z}/{x}/{y}.png) where the deepest
+# level draws every cell at cell_size pixels and each level above halves it.
+import json
+import math
+import os
+
+from PIL import Image
+
+from labyrinth.lab_to_jpg import BACKGROUND, PALETTE, maze_to_palette_image
+from labyrinth.maze_format import MazeFile, iter_maze_rows
+
+
+def maze_dimensions(path: str):
+    if path.endswith(".maze"):
+        with MazeFile(path) as maze:
+            return maze.rows, maze.cols
+    rows = cols = 0
+    for row in iter_maze_rows(path):
+        cols = cols or len(row)
+        rows += 1
+    return rows, cols
+
+
+def tile_path(out_dir: str, z: int, x: int, y: int) -> str:
+    return os.path.join(out_dir, str(z), str(x), f"{y}.png")
+
+
+def _save_tile(img, out_dir, z, x, y, **params):
+    path = tile_path(out_dir, z, x, y)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    img.save(path, **params)
+
+
+def _edge_tile(img, box, tile_size):
+    """Crop of a band image that may run past its right or bottom edge.
+
+    Pillow fills the part of a crop outside the image with index 0, the open
+    colour, so the overhang is drawn on a BACKGROUND tile instead.
+    """
+    left, top, right, bottom = box
+    tile = Image.new("P", (tile_size, tile_size), BACKGROUND)
+    tile.putpalette(PALETTE)
+    tile.paste(img.crop((left, top, min(right, img.width), min(bottom, img.height))), (0, 0))
+    return tile
+
+
+def render_tiles(maze_path: str, out_dir: str, cell_size: int = 20, tile_size: int = 256) -> dict:
+    """Write the tile pyramid for a text or .maze file and return its metadata.
+
+    Only one band of tile_size pixel rows is held in memory at a time, so
+    memory grows with the maze width and the tile size, never with its height.
+    Lower zoom levels are built from the four child tiles already on disk.
+    maze_path must be a regular file, not a pipe: it is read once for its
+    dimensions and again for its rows.
+    """
+    rows, cols = maze_dimensions(maze_path)
+    width, height = cols * cell_size, rows * cell_size
+    tiles_x, tiles_y = math.ceil(width / tile_size), math.ceil(height / tile_size)
+    max_zoom = math.ceil(math.log2(max(tiles_x, tiles_y, 1)))
+
+    # Deepest level, one band of tile rows at a time
+    row_iter = iter_maze_rows(maze_path)
+    band, band_start = [], 0
+    for ty in range(tiles_y):
+        first = ty * tile_size // cell_size
+        last = min(rows, -(-(ty + 1) * tile_size // cell_size))
+        drop = first - band_start
+        band, band_start = band[drop:], first
+        while band_start + len(band) < last:
+            band.append(next(row_iter))
+        img = maze_to_palette_image(band, cell_size)
+        offset = ty * tile_size - first * cell_size
+        for tx in range(tiles_x):
+            box = (tx * tile_size, offset, (tx + 1) * tile_size, offset + tile_size)
+            if box[2] <= img.width and box[3] <= img.height:
+                _save_tile(img.crop(box), out_dir, max_zoom, tx, ty)
+            else:
+                _save_tile(_edge_tile(img, box, tile_size), out_dir, max_zoom, tx, ty, transparency=BACKGROUND)
+
+    # Each upper level merges 2x2 child tiles and downsamples them, in RGBA
+    # so the transparent area past the maze stays transparent
+    level_x, level_y = tiles_x, tiles_y
+    for z in range(max_zoom - 1, -1, -1):
+        child_x, child_y = level_x, level_y
+        level_x, level_y = math.ceil(child_x / 2), math.ceil(child_y / 2)
+        for tx in range(level_x):
+            for ty in range(level_y):
+                merged = Image.new("RGBA", (2 * tile_size, 2 * tile_size), (0, 0, 0, 0))
+                for dx in (0, 1):
+                    for dy in (0, 1):
+                        cx, cy = 2 * tx + dx, 2 * ty + dy
+                        if cx < child_x and cy < child_y:
+                            with Image.open(tile_path(out_dir, z + 1, cx, cy)) as child:
+                                merged.paste(child.convert("RGBA"), (dx * tile_size, dy * tile_size))
+                _save_tile(merged.resize((tile_size, tile_size), Image.BOX), out_dir, z, tx, ty)
+
+    meta = {
+        "source": os.path.basename(maze_path),
+        "rows": rows,
+        "cols": cols,
+        "cell_size": cell_size,
+        "tile_size": tile_size,
+        "width": width,
+        "height": height,
+        "min_zoom": 0,
+        "max_zoom": max_zoom,
+        "url": "{z}/{x}/{y}.png",
+    }
+    with open(os.path.join(out_dir, "tiles.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    print(f"Tiles saved in {out_dir} (zoom 0-{max_zoom})")
+    return meta
@@ -1,12 +1,12 @@
 # Display Menu in Terminal
-from labyrinth.generate import generationlabyrinth
-from labyrinth.generate_file import generate_file
-from algorithm.a_star import solve_maze_astar
-from algorithm.recu_backtraking import solve_maze_backtracking
-from labyrinth.lab_to_jpg import txt_to_image
+# Generators, solvers and Pillow are imported where a menu entry uses them,
+# so the menu comes up without loading any of them.
+from labyrinth.registry import RENDERERS
 
 
 def display_labyrinth():
+    from labyrinth.generate import generationlabyrinth
+    from labyrinth.generate_file import generate_file
     print("\nWelcome to Amazing Mazes, labyrinths of the Minotaur\n")
     labyrinth_content = generationlabyrinth()
     txt_path = generate_file(labyrinth_content)
@@ -14,7 +14,7 @@ def display_labyrinth():
     display_img = input("\nDo you want to convert labyrinth generated ASCII into an image? (y/n): ").strip().lower()
     if display_img == 'y':
         output_file = txt_path.replace(".txt", ".jpg")  
-        txt_to_image(txt_path, output_file)
+        RENDERERS["image"](txt_path, output_file)
     else:
         return
 
@@ -78,12 +78,16 @@ def solve_existing_maze():
         algo_choice = 2
     
     if algo_choice == 1:
+        from algorithm.recu_backtraking import solve_maze_backtracking
         return solve_maze_backtracking(filename)
     else:
+        from algorithm.a_star import solve_maze_astar
         return solve_maze_astar(filename)
 
 
 def compare_algorithms(filename: str):
+    from algorithm.a_star import solve_maze_astar
+    from algorithm.recu_backtraking import solve_maze_backtracking
     print(f"\n === COMPARISON OF ALGORITHMS === ")
     print(f"Maze: {filename}.txt\n")
     
@@ -132,6 +136,7 @@ def main():
                 solver_choice = display_menu()
                 
                 if solver_choice == "astar":
+                    from algorithm.a_star import solve_maze_astar
                     print(f"\n Solving maze '{filename}' with A*...")
                     success = solve_maze_astar(filename)
                     if success:
@@ -140,6 +145,7 @@ def main():
                         print("\n Failed to solve the maze with A*.")
                 
                 elif solver_choice == "backtracking":
+                    from algorithm.recu_backtraking import solve_maze_backtracking
                     print(f"\n Solving maze '{filename}' with Recursive Backtracking...")
                     success = solve_maze_backtracking(filename)
                     if success:
@@ -0,0 +1,33 @@
+import random
+from collections import deque
+
+from labyrinth.generate import generate_kruskal_grid
+from labyrinth.grid import add_entrance_exit, grid_to_text
+
+
+def kruskal_maze(size, seed, knock_out=0):
+    """Kruskal maze as lists of '#'/'.', braided by opening `knock_out` random inner walls."""
+    grid = generate_kruskal_grid(size, seed)
+    add_entrance_exit(grid, size)
+    maze = [list(row) for row in grid_to_text(grid, size).split("\n")]
+    rng = random.Random(seed)
+    while knock_out:
+        r, c = rng.randrange(1, size - 1), rng.randrange(1, size - 1)
+        # (r + c) odd is a wall between two cells, so opening it adds a loop
+        if maze[r][c] == "#" and (r + c) % 2:
+            maze[r][c] = "."
+            knock_out -= 1
+    return maze
+
+
+def bfs_distances(maze, source):
+    """Reference BFS: {cell: steps from source} for every open cell it reaches."""
+    dist = {source: 0}
+    queue = deque([source])
+    while queue:
+        r, c = queue.popleft()
+        for n in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+            if n not in dist and 0 <= n[0] < len(maze) and 0 <= n[1] < len(maze[0]) and maze[n[0]][n[1]] == ".":
+                dist[n] = dist[(r, c)] + 1
+                queue.append(n)
+    return dist
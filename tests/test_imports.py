@@ -0,0 +1,9 @@
+from amazing_mazes.importtime import DEFAULT_MODULES, check_imports
+
+
+def test_entry_points_stay_within_the_import_budget():
+    results = check_imports(repeats=3)
+    assert [r["module"] for r in results] == DEFAULT_MODULES
+    for result in results:
+        assert result["heavy"] == [], result
+        assert not result["over_budget"], result
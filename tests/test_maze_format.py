@@ -0,0 +1,28 @@
+import pytest
+
+from labyrinth.maze_core import find_start_and_end
+from labyrinth.maze_format import MazeFile, write_maze_binary
+
+OPEN_MAZE = "#.###\n#...#\n###.#\n#...#\n###.#\n"
+CLOSED_TOP = "#####\n#...#\n###.#\n#...#\n###.#"
+CLOSED_BOTTOM = "#.###\n#...#\n###.#\n#...#\n#####"
+
+
+@pytest.mark.parametrize("text", [OPEN_MAZE, CLOSED_TOP, CLOSED_BOTTOM])
+def test_round_trip_keeps_rows_and_endpoints(tmp_path, text):
+    path = str(tmp_path / "maze.maze")
+    rows = [row for row in text.split("\n") if row]
+    assert write_maze_binary(path, text.split("\n")) == (len(rows), len(rows[0]))
+    with MazeFile(path) as maze:
+        assert list(maze) == rows
+        assert (maze.entrance, maze.exit) == find_start_and_end([list(row) for row in rows])
+
+
+def test_missing_endpoints_are_none(tmp_path):
+    path = str(tmp_path / "maze.maze")
+    write_maze_binary(path, CLOSED_TOP.split("\n"))
+    with MazeFile(path) as maze:
+        assert maze.entrance is None and maze.exit == (4, 3)
+    write_maze_binary(path, CLOSED_BOTTOM.split("\n"))
+    with MazeFile(path) as maze:
+        assert maze.entrance == (0, 1) and maze.exit is None
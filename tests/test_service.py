@@ -0,0 +1,31 @@
+import asyncio
+
+from amazing_mazes.service import MazeService
+
+
+async def _exchange(request: bytes) -> bytes:
+    service = MazeService(workers=1)
+    server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+    try:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(request)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+    finally:
+        server.close()
+        await server.wait_closed()
+        service.close()
+
+
+def test_oversized_body_gets_413_and_the_connection_closes():
+    response = asyncio.run(_exchange(b"POST /solve HTTP/1.1\r\nContent-Length: 99999999999\r\n\r\n"))
+    assert response.startswith(b"HTTP/1.1 413 ")
+    assert b"Connection: close" in response
+    assert response.endswith(b'{"error": "Body too large."}')
+
+
+def test_health_answers_after_the_size_check():
+    response = asyncio.run(_exchange(b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n"))
+    assert response.startswith(b"HTTP/1.1 200 ")
@@ -0,0 +1,49 @@
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from labyrinth.generate import generate_dfs_grid
+from labyrinth.grid import add_entrance_exit, write_grid_text
+from labyrinth.lab_to_jpg import maze_to_palette_image
+from labyrinth.maze_format import iter_maze_rows
+from labyrinth.tiles import render_tiles, tile_path
+
+
+def write_maze(path, size, seed=1):
+    grid = generate_dfs_grid(size, seed)
+    add_entrance_exit(grid, size)
+    write_grid_text(grid, size, str(path))
+    return str(path)
+
+
+def test_edge_tiles_match_full_render_and_are_transparent_past_the_maze(tmp_path):
+    # 101 cells * 7 px = 707 px, so the last column and row of 64 px tiles overhang
+    maze = write_maze(tmp_path / "maze.txt", 101)
+    meta = render_tiles(maze, str(tmp_path / "tiles"), cell_size=7, tile_size=64)
+    full = maze_to_palette_image(list(iter_maze_rows(maze)), 7).convert("RGBA")
+    assert meta["width"] == meta["height"] == 707
+
+    z = meta["max_zoom"]
+    for x in range(12):
+        for y in range(12):
+            with Image.open(tile_path(str(tmp_path / "tiles"), z, x, y)) as tile:
+                tile = tile.convert("RGBA")
+            assert tile.size == (64, 64)
+            inside_w, inside_h = min(64, 707 - x * 64), min(64, 707 - y * 64)
+            expected = full.crop((x * 64, y * 64, x * 64 + inside_w, y * 64 + inside_h))
+            assert tile.crop((0, 0, inside_w, inside_h)).tobytes() == expected.tobytes()
+            if inside_w < 64:
+                assert tile.crop((inside_w, 0, 64, 64)).getextrema()[3] == (0, 0)
+            if inside_h < 64:
+                assert tile.crop((0, inside_h, 64, 64)).getextrema()[3] == (0, 0)
+
+
+def test_upper_levels_keep_the_area_past_the_maze_transparent(tmp_path):
+    maze = write_maze(tmp_path / "maze.txt", 101)
+    render_tiles(maze, str(tmp_path / "tiles"), cell_size=7, tile_size=64)
+    # zoom 0 shrinks 1024 px of pyramid to 64 px: the maze covers 707 / 16 = 44 px
+    with Image.open(tile_path(str(tmp_path / "tiles"), 0, 0, 0)) as top:
+        top = top.convert("RGBA")
+    assert top.crop((0, 0, 44, 44)).getextrema()[3] == (255, 255)
+    assert top.crop((45, 0, 64, 64)).getextrema()[3] == (0, 0)
+    assert top.crop((0, 45, 64, 64)).getextrema()[3] == (0, 0)
@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from algorithm.tree_index import TreeIndex
+from tests.conftest import bfs_distances, kruskal_maze
+
+
+def test_distances_match_bfs_on_a_perfect_maze():
+    maze = kruskal_maze(41, 3)
+    index = TreeIndex.build(maze, (0, maze[0].index(".")))
+    rng = random.Random(3)
+    for _ in range(30):
+        a = (rng.randrange(1, 40, 2), rng.randrange(1, 40, 2))
+        b = (rng.randrange(1, 40, 2), rng.randrange(1, 40, 2))
+        path = index.path(a, b)
+        assert index.distance(a, b) == bfs_distances(maze, a)[b] == len(path) - 1
+        assert path[0] == a and path[-1] == b
+
+
+def test_braided_maze_is_rejected():
+    maze = kruskal_maze(41, 3, knock_out=20)
+    with pytest.raises(ValueError):
+        TreeIndex.build(maze, (0, maze[0].index(".")))
+
+
+def test_loop_plus_separate_piece_is_rejected():
+    # The loop adds one edge too many and the detached corridor one too few,
+    # so edges == nodes - 1 holds although the maze is not a tree.
+    maze = [list(row) for row in (
+        "#.#######",
+        "#.......#",
+        "#.#####.#",
+        "#.......#",
+        "#########",
+        "#.....###",
+        "#########",
+    )]
+    with pytest.raises(ValueError):
+        TreeIndex.build(maze, (0, 1))
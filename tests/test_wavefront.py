@@ -0,0 +1,41 @@
+import pytest
+
+from algorithm import wavefront
+from labyrinth.maze_core import MazeCore
+from tests.conftest import bfs_distances, kruskal_maze
+
+
+def maze_core(size, seed, knock_out=0):
+    return MazeCore.from_maze(kruskal_maze(size, seed, knock_out))
+
+
+MAZES = [(31, 1, 0), (41, 2, 40), (51, 3, 200)]
+
+
+@pytest.mark.parametrize("size,seed,knock_out", MAZES)
+def test_python_wave_matches_bfs(size, seed, knock_out):
+    maze = kruskal_maze(size, seed, knock_out)
+    core = MazeCore.from_maze(maze)
+    dist, reached = wavefront._wave_python(core.masks, core.width, core.index(core.entrance), None)
+    expected = bfs_distances(maze, core.entrance)
+    assert reached.count(1) == len(expected)
+    for cell, d in expected.items():
+        assert dist[core.index(cell)] == d
+
+
+@pytest.mark.parametrize("size,seed,knock_out", MAZES)
+def test_numpy_wave_matches_python(size, seed, knock_out):
+    pytest.importorskip("numpy")
+    core = maze_core(size, seed, knock_out)
+    source = core.index(core.entrance)
+    assert wavefront._wave_numpy(core.masks, core.width, source, None) == \
+        wavefront._wave_python(core.masks, core.width, source, None)
+
+
+def test_numpy_wave_stops_with_the_same_exit_distance():
+    pytest.importorskip("numpy")
+    core = maze_core(41, 4, 60)
+    source, stop = core.index(core.entrance), core.index(core.exit)
+    numpy_dist, _ = wavefront._wave_numpy(core.masks, core.width, source, stop)
+    python_dist, _ = wavefront._wave_python(core.masks, core.width, source, stop)
+    assert numpy_dist[stop] == python_dist[stop] > 0